@@ -1,86 +1,111 @@
 from __future__ import annotations
 
 import argparse
-import json
+import functools
+import operator
+import sys
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 from .data_store import AdvisorData, load_data_json
-from .excel_parser import build_json_dataset, build_workbook_data
+from .jsonio import write_json
 from .models import TeamPlan
-from .recommender import BattleAdvisor, split_style_input
-from .reporter import build_html_report, render_console_report
-from .style_database import (
-    build_style_database,
-    write_style_database_html,
-    write_style_database_json,
+
+
+_STYLE_META = operator.attrgetter("style_name", "character", "rarity")
+_SC_BASE = operator.attrgetter(
+    "role", "total_score", "attack_score", "support_score", "debuff_score", "weakness_factor"
 )
-from .web_app import run_web_app
-from .web_lookup import StyleWebInfoResolver
+_SKILLS = operator.attrgetter("breaker_skill", "finisher_skill", "support_skill", "debuff_skill")
 
 
 def _load_data(args: argparse.Namespace) -> AdvisorData:
     if args.data:
-        loaded = load_data_json(args.data)
-        return AdvisorData(loaded.styles, loaded.skills, loaded.enemies, loaded.knowledge)
+        return load_data_json(args.data, use_cache=not args.no_cache)
 
     if not args.xlsx:
         raise ValueError("--data か --xlsx のどちらかを指定してください")
 
+    from .excel_parser import build_workbook_data
+
     wb = build_workbook_data(args.xlsx)
     return AdvisorData(wb.styles, wb.skills, wb.enemies, wb.knowledge)
 
 
+def _needs_data(func: Callable[[argparse.Namespace, AdvisorData], int]) -> Callable[[argparse.Namespace], int]:
+    """Load the dataset for ``func`` only after ``main`` has validated the arguments."""
+
+    @functools.wraps(func)
+    def run(args: argparse.Namespace) -> int:
+        return func(args, _load_data(args))
+
+    run.needs_data = True
+    return run
+
+
+def _check_data_args(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    source = args.data or args.xlsx
+    if not source:
+        parser.error("--data か --xlsx のどちらかを指定してください")
+    if not Path(source).is_file():
+        parser.error(f"file not found: {source}")
+
+
 def _team_payload(plan: TeamPlan, web_infos: Optional[dict] = None) -> dict:
     web_infos = web_infos or {}
+    team = []
+    for sc in plan.team:
+        name, character, rarity = _STYLE_META(sc.style)
+        role, total, attack, support, debuff, weakness = _SC_BASE(sc)
+        breaker, finisher, support_skill, debuff_skill = _SKILLS(sc)
+        info = web_infos.get(name)
+        team.append(
+            {
+                "style_name": name,
+                "character": character,
+                "rarity": rarity,
+                "role": role,
+                "total_score": total,
+                "attack_score": attack,
+                "support_score": support,
+                "debuff_score": debuff,
+                "breaker_skill": breaker.skill_name if breaker else None,
+                "finisher_skill": finisher.skill_name if finisher else None,
+                "support_skill": support_skill.skill_name if support_skill else None,
+                "debuff_skill": debuff_skill.skill_name if debuff_skill else None,
+                "weakness_factor": weakness,
+                "web_info": info.to_dict() if info else None,
+            }
+        )
+
     return {
         "enemy": plan.enemy.to_dict() if plan.enemy else None,
         "estimated_damage": plan.estimated_damage,
         "relative_score": plan.relative_score,
         "turn_plan": plan.turn_plan,
-        "team": [
-            {
-                "style_name": sc.style.style_name,
-                "character": sc.style.character,
-                "rarity": sc.style.rarity,
-                "role": sc.role,
-                "total_score": sc.total_score,
-                "attack_score": sc.attack_score,
-                "support_score": sc.support_score,
-                "debuff_score": sc.debuff_score,
-                "breaker_skill": sc.breaker_skill.skill_name if sc.breaker_skill else None,
-                "finisher_skill": sc.finisher_skill.skill_name if sc.finisher_skill else None,
-                "support_skill": sc.support_skill.skill_name if sc.support_skill else None,
-                "debuff_skill": sc.debuff_skill.skill_name if sc.debuff_skill else None,
-                "weakness_factor": sc.weakness_factor,
-                "web_info": (
-                    web_infos[sc.style.style_name].to_dict()
-                    if sc.style.style_name in web_infos
-                    else None
-                ),
-            }
-            for sc in plan.team
-        ],
+        "team": team,
         "unmatched_owned": plan.unmatched_owned,
         "unmatched_wanted": plan.unmatched_wanted,
     }
 
 
 def cmd_build_data(args: argparse.Namespace) -> int:
+    from .excel_parser import build_json_dataset
+
     payload = build_json_dataset(args.xlsx, args.out)
-    knowledge_count = 0
-    if isinstance(payload.get("knowledge"), dict):
-        for value in payload["knowledge"].values():
-            if isinstance(value, list):
-                knowledge_count += len(value)
+    kv = payload.get("knowledge")
+    knowledge_count = sum(len(v) for v in kv.values() if type(v) is list) if type(kv) is dict else 0
     print(
         f"dataset written: {args.out} (styles={len(payload['styles'])}, skills={len(payload['skills'])}, enemies={len(payload['enemies'])}, knowledge_rows={knowledge_count})"
     )
     return 0
 
 
-def cmd_recommend(args: argparse.Namespace) -> int:
-    data = _load_data(args)
+@_needs_data
+def cmd_recommend(args: argparse.Namespace, data: AdvisorData) -> int:
+    from .recommender import BattleAdvisor, split_style_input
+    from .reporter import render_console_report
+
     advisor = BattleAdvisor(data.styles, data.skills, data.enemies, data.knowledge)
 
     owned = split_style_input(args.owned)
@@ -97,6 +122,8 @@ def cmd_recommend(args: argparse.Namespace) -> int:
 
     web_infos = {}
     if args.fetch_images:
+        from .web_lookup import StyleWebInfoResolver
+
         resolver = StyleWebInfoResolver(args.cache)
         for sc in plan.team:
             info = resolver.lookup(sc.style.style_name, sc.style.character)
@@ -106,23 +133,24 @@ def cmd_recommend(args: argparse.Namespace) -> int:
     print(render_console_report(plan, web_infos))
 
     if args.json_out:
-        out = Path(args.json_out)
+        out = args.json_out
         out.parent.mkdir(parents=True, exist_ok=True)
-        out.write_text(
-            json.dumps(_team_payload(plan, web_infos), ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+        write_json(out, _team_payload(plan, web_infos))
         print(f"\njson report: {out}")
 
     if args.html_report:
+        from .reporter import build_html_report
+
         build_html_report(plan, web_infos, args.html_report)
         print(f"html report: {args.html_report}")
 
     return 0
 
 
-def cmd_serve(args: argparse.Namespace) -> int:
-    data = _load_data(args)
+@_needs_data
+def cmd_serve(args: argparse.Namespace, data: AdvisorData) -> int:
+    from .web_app import run_web_app
+
     run_web_app(
         data=data,
         host=args.host,
@@ -133,8 +161,14 @@ def cmd_serve(args: argparse.Namespace) -> int:
     return 0
 
 
-def cmd_build_style_db(args: argparse.Namespace) -> int:
-    data = _load_data(args)
+@_needs_data
+def cmd_build_style_db(args: argparse.Namespace, data: AdvisorData) -> int:
+    from .style_database import (
+        build_style_database,
+        write_style_database_html,
+        write_style_database_json,
+    )
+
     payload = build_style_database(
         data=data,
         cache_path=args.cache,
@@ -151,21 +185,20 @@ def cmd_build_style_db(args: argparse.Namespace) -> int:
     return 0
 
 
-def build_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(
-        prog="hbr-advisor",
-        description="HBR style-based team recommendation and simple damage simulation",
-    )
-    sub = parser.add_subparsers(dest="command", required=True)
-
-    p_build = sub.add_parser("build-data", help="Parse xlsx and build JSON dataset")
-    p_build.add_argument("--xlsx", required=True, help="Path to source xlsx file")
-    p_build.add_argument("--out", required=True, help="Path to output JSON")
+def _add_build_data(p_build: argparse.ArgumentParser) -> None:
+    p_build.add_argument("--xlsx", type=Path, required=True, help="Path to source xlsx file")
+    p_build.add_argument("--out", type=Path, required=True, help="Path to output JSON")
     p_build.set_defaults(func=cmd_build_data)
 
-    p_rec = sub.add_parser("recommend", help="Recommend team and battle plan")
-    p_rec.add_argument("--data", help="Path to prebuilt JSON dataset")
-    p_rec.add_argument("--xlsx", help="Path to xlsx if data JSON is not given")
+
+def _add_recommend(p_rec: argparse.ArgumentParser) -> None:
+    p_rec.add_argument("--data", type=Path, help="Path to prebuilt JSON dataset")
+    p_rec.add_argument("--xlsx", type=Path, help="Path to xlsx if data JSON is not given")
+    p_rec.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-parse --data instead of using the pickled dataset cache",
+    )
     p_rec.add_argument(
         "--owned",
         default="",
@@ -185,58 +218,71 @@ def build_parser() -> argparse.ArgumentParser:
     p_rec.add_argument("--fetch-images", action="store_true")
     p_rec.add_argument(
         "--cache",
+        type=Path,
         default="data/image_cache.json",
         help="Image lookup cache JSON path",
     )
     p_rec.add_argument(
         "--json-out",
-        default="",
+        type=Path,
         help="Write recommendation payload JSON",
     )
     p_rec.add_argument(
         "--html-report",
-        default="",
+        type=Path,
         help="Write visual HTML report (images + squad + style)",
     )
     p_rec.set_defaults(func=cmd_recommend)
 
-    p_serve = sub.add_parser(
-        "serve", help="Run local selectable web UI (owned styles are selected from list)"
+
+def _add_serve(p_serve: argparse.ArgumentParser) -> None:
+    p_serve.add_argument("--data", type=Path, help="Path to prebuilt JSON dataset")
+    p_serve.add_argument("--xlsx", type=Path, help="Path to xlsx if data JSON is not given")
+    p_serve.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-parse --data instead of using the pickled dataset cache",
     )
-    p_serve.add_argument("--data", help="Path to prebuilt JSON dataset")
-    p_serve.add_argument("--xlsx", help="Path to xlsx if data JSON is not given")
     p_serve.add_argument("--host", default="127.0.0.1", help="Bind host")
     p_serve.add_argument("--port", type=int, default=8787, help="Bind port")
     p_serve.add_argument(
         "--cache",
+        type=Path,
         default="data/image_cache.json",
         help="Image lookup cache JSON path",
     )
     p_serve.add_argument(
         "--style-db",
+        type=Path,
         default="data/style_database.json",
         help="Style database JSON for fast 6-style selector (squad/image linked)",
     )
     p_serve.set_defaults(func=cmd_serve)
 
-    p_style = sub.add_parser(
-        "build-style-db",
-        help="Build full graphical style database (squad-character-style linked)",
+
+def _add_build_style_db(p_style: argparse.ArgumentParser) -> None:
+    p_style.add_argument("--data", type=Path, help="Path to prebuilt JSON dataset")
+    p_style.add_argument("--xlsx", type=Path, help="Path to xlsx if data JSON is not given")
+    p_style.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-parse --data instead of using the pickled dataset cache",
     )
-    p_style.add_argument("--data", help="Path to prebuilt JSON dataset")
-    p_style.add_argument("--xlsx", help="Path to xlsx if data JSON is not given")
     p_style.add_argument(
         "--cache",
+        type=Path,
         default="data/image_cache.json",
         help="Web info cache JSON path",
     )
     p_style.add_argument(
         "--out-json",
+        type=Path,
         default="data/style_database.json",
         help="Output style database JSON path",
     )
     p_style.add_argument(
         "--out-html",
+        type=Path,
         default="reports/style_database.html",
         help="Output graphical style database HTML path",
     )
@@ -258,12 +304,61 @@ def build_parser() -> argparse.ArgumentParser:
     )
     p_style.set_defaults(func=cmd_build_style_db)
 
+
+# name -> (help, argument builder); order is the order shown in --help.
+_KNOWN: dict[str, tuple[str, Callable[[argparse.ArgumentParser], None]]] = {
+    "build-data": ("Parse xlsx and build JSON dataset", _add_build_data),
+    "recommend": ("Recommend team and battle plan", _add_recommend),
+    "serve": (
+        "Run local selectable web UI (owned styles are selected from list)",
+        _add_serve,
+    ),
+    "build-style-db": (
+        "Build full graphical style database (squad-character-style linked)",
+        _add_build_style_db,
+    ),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def build_parser() -> argparse.ArgumentParser:
+    """Return the full top-level parser, used for help and usage errors.
+
+    The parser is cached and shared between calls, so callers must not add
+    arguments or defaults to it.
+    """
+    parser = argparse.ArgumentParser(
+        prog="hbr-advisor",
+        description="HBR style-based team recommendation and simple damage simulation",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, (help_text, add_arguments) in _KNOWN.items():
+        add_arguments(sub.add_parser(name, help=help_text))
+    return parser
+
+
+@functools.lru_cache(maxsize=None)
+def _build_command_parser(name: str) -> argparse.ArgumentParser:
+    """Standalone (cached) parser for one subcommand, equivalent to its ``build_parser`` subparser."""
+    parser = argparse.ArgumentParser(prog=f"hbr-advisor {name}")
+    _KNOWN[name][1](parser)
+    parser.set_defaults(command=name)
     return parser
 
 
 def main(argv: Optional[list[str]] = None) -> int:
-    parser = build_parser()
-    args = parser.parse_args(argv)
+    if argv is None:
+        argv = sys.argv[1:]
+    # A known subcommand is parsed directly by its own parser; build_parser is
+    # only needed for top-level help and usage errors.
+    if argv and argv[0] in _KNOWN:
+        parser = _build_command_parser(argv[0])
+        args = parser.parse_args(argv[1:])
+    else:
+        parser = build_parser()
+        args = parser.parse_args(argv)
+    if getattr(args.func, "needs_data", False):
+        _check_data_args(parser, args)
     return args.func(args)
 
 
@@ -1,43 +1,189 @@
 from __future__ import annotations
 
-import json
-from dataclasses import dataclass
+import hashlib
+import operator
+import os
+import pickle
+from dataclasses import fields
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
+from .jsonio import loads_json
 from .models import Enemy, Skill, Style
 
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional accelerator
+    ijson = None
+
+
+# Bump when the pickled layout of AdvisorData or the models changes.
+DATA_CACHE_VERSION = 5
+# ijson parses ~6x slower than orjson (36 ms vs 6 ms on the bundled ~1 MB
+# dataset) and only bounds memory, so stream only files far larger than that.
+STREAM_MIN_BYTES = 64_000_000
+
 
-@dataclass
 class AdvisorData:
-    styles: list[Style]
-    skills: list[Skill]
-    enemies: list[Enemy]
-    knowledge: dict[str, Any]
+    """Parsed dataset."""
 
+    __slots__ = ("styles", "skills", "enemies", "knowledge")
 
+    def __init__(
+        self,
+        styles: list[Style],
+        skills: list[Skill],
+        enemies: list[Enemy],
+        knowledge: dict[str, Any],
+    ):
+        self.styles = styles
+        self.skills = skills
+        self.enemies = enemies
+        self.knowledge = knowledge
 
-def _style_from_dict(obj: dict[str, Any]) -> Style:
-    return Style(**obj)
 
 
+# Positional getters in dataclass field order; rows missing a field (older
+# dataset JSON relying on defaults) fall back to keyword construction.
+_STYLE_GET = operator.itemgetter(*(f.name for f in fields(Style)))
+_SKILL_GET = operator.itemgetter(*(f.name for f in fields(Skill)))
+_ENEMY_GET = operator.itemgetter(*(f.name for f in fields(Enemy)))
 
-def _skill_from_dict(obj: dict[str, Any]) -> Skill:
-    return Skill(**obj)
 
 
+def _style_from_dict(obj: dict[str, Any]) -> Style:
+    try:
+        return Style(*_STYLE_GET(obj))
+    except KeyError:
+        return Style(**obj)
 
-def _enemy_from_dict(obj: dict[str, Any]) -> Enemy:
-    return Enemy(**obj)
 
 
+def _skill_from_dict(obj: dict[str, Any]) -> Skill:
+    try:
+        return Skill(*_SKILL_GET(obj))
+    except KeyError:
+        return Skill(**obj)
+
 
-def load_data_json(path: str | Path) -> AdvisorData:
-    payload = json.loads(Path(path).read_text(encoding="utf-8"))
-    styles = [_style_from_dict(x) for x in payload.get("styles", [])]
-    skills = [_skill_from_dict(x) for x in payload.get("skills", [])]
-    enemies = [_enemy_from_dict(x) for x in payload.get("enemies", [])]
+def _enemy_from_dict(obj: dict[str, Any]) -> Enemy:
+    try:
+        return Enemy(*_ENEMY_GET(obj))
+    except KeyError:
+        return Enemy(**obj)
+
+
+
+def _cache_dir() -> Path:
+    return Path(os.environ.get("HBR_CACHE") or Path.home() / ".cache" / "hbr-advisor")
+
+
+def _cache_path(path: Path) -> Optional[Path]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    raw = f"{DATA_CACHE_VERSION}:{path.resolve()}:{st.st_mtime_ns}:{st.st_size}"
+    key = hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+    return _cache_dir() / f"{key}.pkl"
+
+
+def _read_cache(cache: Path) -> Optional[AdvisorData]:
+    try:
+        loaded = pickle.loads(cache.read_bytes())
+    except Exception:
+        return None
+    return loaded if isinstance(loaded, AdvisorData) else None
+
+
+def _write_cache(cache: Path, data: AdvisorData) -> None:
+    try:
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        cache.write_bytes(pickle.dumps(data, protocol=5))
+    except Exception:
+        # The cache is only an accelerator; never fail a load because of it.
+        pass
+
+
+_STREAM_ROWS = {
+    "styles.item": ("styles", _style_from_dict),
+    "skills.item": ("skills", _skill_from_dict),
+    "enemies.item": ("enemies", _enemy_from_dict),
+}
+_CONTAINER_START = ("start_map", "start_array")
+_CONTAINER_END = ("end_map", "end_array")
+
+
+def _stream_data_json(path: Path) -> AdvisorData:
+    # A single pass over the parser events: each styles/skills/enemies row and
+    # the knowledge object are built as they arrive, so only one row is
+    # materialized at a time and the file is tokenized once.
+    rows: dict[str, list[Any]] = {"styles": [], "skills": [], "enemies": []}
+    knowledge: Any = {}
+    with path.open("rb") as fh:
+        events = ijson.parse(fh, use_float=True)
+        for prefix, event, value in events:
+            if prefix in _STREAM_ROWS:
+                key, hydrate = _STREAM_ROWS[prefix]
+            elif prefix == "knowledge":
+                key, hydrate = "", None
+            else:
+                continue
+            if event in _CONTAINER_START:
+                builder = ijson.ObjectBuilder()
+                depth = 0
+                while True:
+                    builder.event(event, value)
+                    if event in _CONTAINER_START:
+                        depth += 1
+                    elif event in _CONTAINER_END:
+                        depth -= 1
+                        if not depth:
+                            break
+                    _, event, value = next(events)
+                value = builder.value
+            elif event in _CONTAINER_END or event == "map_key":
+                continue
+            if hydrate is None:
+                knowledge = value
+            else:
+                rows[key].append(hydrate(value))
+    return AdvisorData(
+        styles=rows["styles"],
+        skills=rows["skills"],
+        enemies=rows["enemies"],
+        knowledge=knowledge if isinstance(knowledge, dict) else {},
+    )
+
+
+def _parse_data_json(path: Path) -> AdvisorData:
+    if ijson is not None and path.stat().st_size >= STREAM_MIN_BYTES:
+        return _stream_data_json(path)
+
+    payload = loads_json(path.read_bytes())
+    styles = list(map(_style_from_dict, payload.get("styles", [])))
+    skills = list(map(_skill_from_dict, payload.get("skills", [])))
+    enemies = list(map(_enemy_from_dict, payload.get("enemies", [])))
     knowledge = payload.get("knowledge", {}) if isinstance(payload, dict) else {}
     if not isinstance(knowledge, dict):
         knowledge = {}
     return AdvisorData(styles=styles, skills=skills, enemies=enemies, knowledge=knowledge)
+
+
+def load_data_json(path: str | Path, use_cache: bool = True) -> AdvisorData:
+    """Load the dataset JSON, reusing a pickled copy while the file is unchanged.
+
+    The pickle lives under ``$HBR_CACHE`` (default ``~/.cache/hbr-advisor``) and is
+    keyed by the resolved path, mtime and size of the JSON file.
+    """
+    src = Path(path)
+    cache = _cache_path(src) if use_cache else None
+    if cache is not None and cache.exists():
+        cached = _read_cache(cache)
+        if cached is not None:
+            return cached
+
+    data = _parse_data_json(src)
+    if cache is not None:
+        _write_cache(cache, data)
+    return data
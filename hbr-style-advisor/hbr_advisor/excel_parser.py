@@ -1,55 +1,72 @@
 from __future__ import annotations
 
-import json
+import functools
 import re
+import sys
 import zipfile
-import xml.etree.ElementTree as ET
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Iterator
 
+from .jsonio import write_json_sections
 from .models import Enemy, Skill, Style
 from .utils import clean_style_raw, parse_float, parse_optional_float
 
+try:
+    from lxml import etree as ET
+except ImportError:  # pragma: no cover - optional accelerator
+    import xml.etree.ElementTree as ET
+
 
 MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
 REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
 PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
 NS = {"main": MAIN_NS, "rel": REL_NS, "pkgrel": PKG_REL_NS}
 
+# Fully-qualified tags for the per-cell hot path (avoids prefix/NS-map resolution).
+_RELATIONSHIP_TAG = f"{{{PKG_REL_NS}}}Relationship"
+_SHEETS_TAG = f"{{{MAIN_NS}}}sheets"
+_SHEET_TAG = f"{{{MAIN_NS}}}sheet"
+_SHEET_DATA_TAG = f"{{{MAIN_NS}}}sheetData"
+_DIMENSION_TAG = f"{{{MAIN_NS}}}dimension"
+_ROW_TAG = f"{{{MAIN_NS}}}row"
+_C_TAG = f"{{{MAIN_NS}}}c"
+_SI_TAG = f"{{{MAIN_NS}}}si"
+_F_TAG = f"{{{MAIN_NS}}}f"
+_V_TAG = f"{{{MAIN_NS}}}v"
+_IS_TAG = f"{{{MAIN_NS}}}is"
+_T_TAG = f"{{{MAIN_NS}}}t"
+
+
+# Quoted string (doubled "" escapes; an unterminated one runs to the end via
+# \Z), a single paren/comma, or a run of anything else.
+_FORMULA_TOKEN_RE = re.compile(r'"(?:[^"]+|"")*(?:"|\Z)|[(),]|[^",()]+')
 
-def _split_top_level_args(text: str) -> list[str]:
+
+def _split_top_level_args(text: str, maxsplit: int = -1) -> list[str]:
+    """Split on top-level commas; after ``maxsplit`` splits the rest is kept unsplit."""
     args: list[str] = []
     cur: list[str] = []
     depth = 0
-    in_quote = False
-    i = 0
-
-    while i < len(text):
-        ch = text[i]
-        if ch == '"':
-            cur.append(ch)
-            if in_quote and i + 1 < len(text) and text[i + 1] == '"':
-                cur.append('"')
-                i += 2
-                continue
-            in_quote = not in_quote
-            i += 1
-            continue
-
-        if not in_quote:
-            if ch == '(':
-                depth += 1
-            elif ch == ')':
-                depth = max(0, depth - 1)
-            elif ch == ',' and depth == 0:
-                args.append("".join(cur).strip())
-                cur = []
-                i += 1
-                continue
 
-        cur.append(ch)
-        i += 1
+    for m in _FORMULA_TOKEN_RE.finditer(text):
+        tok = m.group()
+        if tok == "(":
+            depth += 1
+        elif tok == ")":
+            depth = max(0, depth - 1)
+        elif tok == "," and depth == 0:
+            args.append("".join(cur).strip())
+            cur = []
+            if len(args) == maxsplit:
+                rest = text[m.end() :]
+                if rest:
+                    args.append(rest.strip())
+                return args
+            continue
+        cur.append(tok)
 
     if cur:
         args.append("".join(cur).strip())
@@ -66,11 +83,13 @@ def _excel_unquote(text: str) -> str:
 
 def _extract_fallback_from_formula(formula: str) -> str | None:
     txt = formula.strip()
-    if not txt.upper().startswith("IFERROR(") or not txt.endswith(")"):
+    if txt[:8].upper() != "IFERROR(" or not txt.endswith(")"):
         return None
 
     body = txt[len("IFERROR(") : -1]
-    args = _split_top_level_args(body)
+    # Only the fallback (second argument) is needed, so stop scanning after it
+    # instead of tokenizing the remaining arguments.
+    args = _split_top_level_args(body, maxsplit=2)
     if len(args) < 2:
         return None
 
@@ -78,26 +97,39 @@ def _extract_fallback_from_formula(formula: str) -> str | None:
     # If fallback itself is wrapped in DUMMYFUNCTION("...")
     if fallback.upper().startswith("__XLUDF.DUMMYFUNCTION(") and fallback.endswith(")"):
         inner = fallback[len("__xludf.DUMMYFUNCTION(") : -1]
-        inner_args = _split_top_level_args(inner)
+        inner_args = _split_top_level_args(inner, maxsplit=1)
         if inner_args:
             return _excel_unquote(inner_args[0])
 
     return _excel_unquote(fallback)
 
 
-def _col_index_from_ref(cell_ref: str) -> int:
-    col = ""
-    for ch in cell_ref:
-        if ch.isalpha():
-            col += ch
-        else:
-            break
+_MAX_PREALLOC_COLS = 64
+
+# Byte -> column digit (A-Z/a-z -> 1..26); 0 marks the end of the letters.
+_COL_LUT = bytearray(256)
+for _i in range(26):
+    _COL_LUT[65 + _i] = _COL_LUT[97 + _i] = _i + 1
+del _i
+
+
+@functools.lru_cache(maxsize=1024)
+def _col_index_from_letters(letters: str, _lut: bytearray = _COL_LUT) -> int:
     idx = 0
-    for ch in col:
-        idx = idx * 26 + (ord(ch.upper()) - 64)
+    for b in letters.encode("ascii", "replace"):
+        v = _lut[b]
+        if not v:
+            break
+        idx = idx * 26 + v
     return idx
 
 
+def _col_index_from_ref(cell_ref: str) -> int:
+    # Column letters repeat on every row, so only the row digits are stripped
+    # and the letters themselves are decoded once.
+    return _col_index_from_letters(cell_ref.rstrip("0123456789"))
+
+
 @dataclass
 class WorkbookData:
     styles: list[Style]
@@ -120,32 +152,49 @@ class XlsxExtractor:
         self._zip = zipfile.ZipFile(self.path)
         self._shared_strings = self._load_shared_strings()
         self._sheet_targets = self._load_sheet_targets()
+        # sheet -> (padded width, rows); only filled by iter_sheet_rows(cache=True).
+        self._row_cache: dict[str, tuple[int, list[tuple[int, list[str]]]]] = {}
 
     def close(self) -> None:
         self._zip.close()
 
     def _load_shared_strings(self) -> list[str]:
-        names = set(self._zip.namelist())
-        if "xl/sharedStrings.xml" not in names:
+        try:
+            self._zip.getinfo("xl/sharedStrings.xml")
+        except KeyError:
             return []
 
-        root = ET.fromstring(self._zip.read("xl/sharedStrings.xml"))
         out: list[str] = []
-        for si in root.findall("main:si", NS):
-            text_parts = [t.text or "" for t in si.findall(".//main:t", NS)]
-            out.append("".join(text_parts))
+        with self._zip.open("xl/sharedStrings.xml") as fh:
+            root = None
+            for event, elem in ET.iterparse(fh, events=("start", "end")):
+                if event == "start":
+                    if root is None:
+                        root = elem
+                    continue
+                if elem.tag != _SI_TAG:
+                    continue
+                # Interned so cells sharing an entry hash and compare by identity.
+                out.append(sys.intern("".join([t.text or "" for t in elem.iter(_T_TAG)]).strip()))
+                root.clear()
         return out
 
+    def _parse_part(self, name: str) -> ET.Element:
+        # Parse straight from the zip stream so the inflated part is never
+        # held as one bytes buffer alongside the tree.
+        with self._zip.open(name) as fh:
+            return ET.parse(fh).getroot()
+
     def _load_sheet_targets(self) -> dict[str, str]:
-        wb = ET.fromstring(self._zip.read("xl/workbook.xml"))
-        rels = ET.fromstring(self._zip.read("xl/_rels/workbook.xml.rels"))
+        wb = self._parse_part("xl/workbook.xml")
+        rels = self._parse_part("xl/_rels/workbook.xml.rels")
         rel_map = {
             rel.get("Id"): rel.get("Target")
-            for rel in rels.findall("pkgrel:Relationship", NS)
+            for rel in rels.iterfind(_RELATIONSHIP_TAG)
         }
 
         out: dict[str, str] = {}
-        for sheet in wb.findall("main:sheets/main:sheet", NS):
+        for sheet in wb.iterfind(f"{_SHEETS_TAG}/{_SHEET_TAG}"):
             name = sheet.get("name")
             rid = sheet.get(f"{{{REL_NS}}}id")
             target = rel_map.get(rid)
@@ -157,69 +206,140 @@ class XlsxExtractor:
         return out
 
     def _cell_value(self, cell: ET.Element) -> str | None:
+        # Values come back already stripped; parsers use them as-is.
         ctype = cell.get("t", "n")
-        formula = cell.find("main:f", NS)
-        v = cell.find("main:v", NS)
-        inline = cell.find("main:is", NS)
-
-        if formula is not None and formula.text:
-            fallback = _extract_fallback_from_formula(formula.text)
-            if fallback is not None:
-                return fallback
-            return "=" + formula.text
+        formula = v = inline = None
+        for child in cell:
+            tag = child.tag
+            if tag == _V_TAG:
+                v = child
+            elif tag == _F_TAG:
+                formula = child
+            elif tag == _IS_TAG:
+                inline = child
+
+        ftext = formula.text if formula is not None else None
+        if ftext:
+            # Cheap prefix gate so ordinary formulas skip the IFERROR parser.
+            if ftext.lstrip()[:8].upper() == "IFERROR(":
+                fallback = _extract_fallback_from_formula(ftext)
+                if fallback is not None:
+                    return fallback.strip()
+            return ("=" + ftext).strip()
 
         if ctype == "s" and v is not None and (v.text or "").isdigit():
             idx = int(v.text)
             if 0 <= idx < len(self._shared_strings):
                 return self._shared_strings[idx]
-            return v.text
+            return v.text.strip()
 
         if ctype == "inlineStr" and inline is not None:
-            tvals = [t.text or "" for t in inline.findall(".//main:t", NS)]
-            return "".join(tvals)
+            tvals = [t.text or "" for t in inline.iter(_T_TAG)]
+            return "".join(tvals).strip()
 
-        if v is not None:
-            return v.text
+        if v is not None and v.text is not None:
+            return v.text.strip()
 
         return None
 
-    def iter_sheet_rows(self, sheet_name: str) -> Iterator[tuple[int, dict[int, str]]]:
+    def iter_sheet_rows(
+        self, sheet_name: str, width: int = 0, cache: bool = False
+    ) -> Iterator[tuple[int, list[str]]]:
+        """Yield ``(row_number, values)`` with ``values`` indexed by 1-based column.
+
+        Missing cells are ``""`` and every row is padded to at least ``width``
+        entries, so callers can index columns below ``width`` directly. Rows are
+        streamed lazily by default; with ``cache=True`` the sheet is parsed once
+        and kept for later passes until ``drop_cache()``.
+        """
+        cached = self._row_cache.get(sheet_name)
+        if cached is None:
+            if not cache:
+                return self._stream_rows(sheet_name, width)
+            cached = self._row_cache[sheet_name] = (
+                width,
+                list(self._stream_rows(sheet_name, width)),
+            )
+        padded, rows = cached
+        if width > padded:
+            for _, values in rows:
+                if len(values) < width:
+                    values.extend([""] * (width - len(values)))
+            self._row_cache[sheet_name] = (width, rows)
+        return iter(rows)
+
+    def drop_cache(self, sheet_name: str | None = None) -> None:
+        if sheet_name is None:
+            self._row_cache.clear()
+        else:
+            self._row_cache.pop(sheet_name, None)
+
+    def _stream_rows(self, sheet_name: str, min_width: int = 0) -> Iterator[tuple[int, list[str]]]:
         target = self._sheet_targets.get(sheet_name)
         if not target:
             return
 
-        root = ET.fromstring(self._zip.read(target))
-        data = root.find("main:sheetData", NS)
-        if data is None:
-            return
-
-        for row in data.findall("main:row", NS):
-            rnum = int(row.get("r") or 0)
-            values: dict[int, str] = {}
-            for cell in row.findall("main:c", NS):
-                cref = cell.get("r")
-                if not cref:
+        # ZipFile serializes access to the shared archive handle itself, so
+        # the knowledge-table worker threads can open parts concurrently.
+        fh = self._zip.open(target)
+
+        # Stream the sheet instead of building the whole DOM: each row is
+        # handled on its end event and then dropped from sheetData.
+        cell_value = self._cell_value
+        col_index = _col_index_from_ref
+        with fh:
+            data = None
+            width = min_width
+            for event, elem in ET.iterparse(fh, events=("start", "end")):
+                tag = elem.tag
+                if event == "start":
+                    if tag == _SHEET_DATA_TAG:
+                        data = elem
+                    elif tag == _DIMENSION_TAG:
+                        # ref="A1:AC500" -> rows are preallocated up to AC
+                        # (capped: stray formatting can stretch the range to XFD).
+                        last = (elem.get("ref") or "").rpartition(":")[2]
+                        width = max(min_width, min(_col_index_from_ref(last) + 1, _MAX_PREALLOC_COLS))
+                    continue
+                if tag != _ROW_TAG or data is None:
                     continue
-                cidx = _col_index_from_ref(cref)
-                value = self._cell_value(cell)
-                if value is not None:
+                if not len(elem):
+                    # Formatting-only rows (often a long blank tail) have no cells.
+                    data.clear()
+                    continue
+
+                rnum = int(elem.get("r") or 0)
+                values = [""] * width
+                has_value = False
+                for cell in elem.iterfind(_C_TAG):
+                    cref = cell.get("r")
+                    if not cref:
+                        continue
+                    value = cell_value(cell)
+                    if value is None:
+                        continue
+                    cidx = col_index(cref)
+                    if cidx >= len(values):
+                        values.extend([""] * (cidx + 1 - len(values)))
                     values[cidx] = value
-            if values:
-                yield rnum, values
+                    has_value = True
+                data.clear()
+                if has_value:
+                    yield rnum, values
 
     def parse_styles(self) -> list[Style]:
         styles: list[Style] = []
         seen: set[str] = set()
 
-        for rnum, row in self.iter_sheet_rows("パッシブ"):
+        for rnum, row in self.iter_sheet_rows("パッシブ", 30):
             if rnum < 2:
                 continue
 
-            alias = str(row.get(2, "")).strip()
-            character = str(row.get(3, "")).strip()
-            style_raw = str(row.get(4, "")).strip()
-            rarity = str(row.get(5, "")).strip().upper()
-            style_name_cell = str(row.get(1, "")).strip()
+            alias = row[2]
+            character = row[3]
+            style_raw = row[4]
+            rarity = row[5].upper()
+            style_name_cell = row[1]
 
             if not character or not style_raw:
                 continue
@@ -231,7 +351,6 @@ class XlsxExtractor:
             else:
                 style_name = style_raw
 
-            style_name = style_name.strip()
             if not style_name or style_name in seen:
                 continue
 
@@ -243,30 +362,30 @@ class XlsxExtractor:
                 character=character,
                 style_raw=style_raw,
                 rarity=rarity,
-                attack_bonus_no_lb=parse_float(row.get(6)),
-                def_bonus_no_lb=parse_float(row.get(8)),
-                attack_bonus_lb3=parse_float(row.get(16)),
-                def_bonus_lb3=parse_float(row.get(18)),
-                crit_damage_no_lb=parse_float(row.get(10)),
-                crit_damage_lb3=parse_float(row.get(20)),
-                crit_rate_no_lb=parse_float(row.get(12)),
-                crit_rate_lb3=parse_float(row.get(22)),
-                destruction_no_lb=parse_float(row.get(14)),
-                destruction_lb3=parse_float(row.get(24)),
-                attack_scope_no_lb=str(row.get(7, "")).strip(),
-                def_scope_no_lb=str(row.get(9, "")).strip(),
-                crit_damage_scope_no_lb=str(row.get(11, "")).strip(),
-                crit_rate_scope_no_lb=str(row.get(13, "")).strip(),
-                destruction_scope_no_lb=str(row.get(15, "")).strip(),
-                attack_scope_lb3=str(row.get(17, "")).strip(),
-                def_scope_lb3=str(row.get(19, "")).strip(),
-                crit_damage_scope_lb3=str(row.get(21, "")).strip(),
-                crit_rate_scope_lb3=str(row.get(23, "")).strip(),
-                destruction_scope_lb3=str(row.get(25, "")).strip(),
-                passive_no_lb=str(row.get(26, "")).strip(),
-                passive_lb3=str(row.get(27, "")).strip(),
-                element_tag=str(row.get(28, "")).strip(),
-                jewel_type=parse_float(row.get(29)),
+                attack_bonus_no_lb=parse_float(row[6]),
+                def_bonus_no_lb=parse_float(row[8]),
+                attack_bonus_lb3=parse_float(row[16]),
+                def_bonus_lb3=parse_float(row[18]),
+                crit_damage_no_lb=parse_float(row[10]),
+                crit_damage_lb3=parse_float(row[20]),
+                crit_rate_no_lb=parse_float(row[12]),
+                crit_rate_lb3=parse_float(row[22]),
+                destruction_no_lb=parse_float(row[14]),
+                destruction_lb3=parse_float(row[24]),
+                attack_scope_no_lb=row[7],
+                def_scope_no_lb=row[9],
+                crit_damage_scope_no_lb=row[11],
+                crit_rate_scope_no_lb=row[13],
+                destruction_scope_no_lb=row[15],
+                attack_scope_lb3=row[17],
+                def_scope_lb3=row[19],
+                crit_damage_scope_lb3=row[21],
+                crit_rate_scope_lb3=row[23],
+                destruction_scope_lb3=row[25],
+                passive_no_lb=row[26],
+                passive_lb3=row[27],
+                element_tag=row[28],
+                jewel_type=parse_float(row[29]),
             )
             styles.append(style)
 
@@ -274,39 +393,35 @@ class XlsxExtractor:
 
     def parse_skills(self) -> list[Skill]:
         skills: list[Skill] = []
+        optional_float = parse_optional_float
 
-        for rnum, row in self.iter_sheet_rows("スキルサブ情報"):
+        for rnum, row in self.iter_sheet_rows("スキルサブ情報", 32):
             if rnum < 2:
                 continue
 
-            skill_name = str(row.get(1, "")).strip()
+            skill_name = row[1]
             if not skill_name:
                 continue
 
-            owner_character = str(row.get(7, "")).strip()
+            owner_character = row[7]
             if not owner_character:
                 continue
 
             skill = Skill(
                 skill_name=skill_name,
-                weapon=str(row.get(2, "")).strip(),
-                element=str(row.get(3, "")).strip(),
-                target=str(row.get(4, "")).strip(),
-                hit=parse_float(row.get(5), 1.0),
-                owner_style_hint=str(row.get(6, "")).strip(),
+                weapon=row[2],
+                element=row[3],
+                target=row[4],
+                hit=parse_float(row[5], 1.0),
+                owner_style_hint=row[6],
                 owner_character=owner_character,
-                sp=parse_float(row.get(8)),
-                multiplier=parse_float(row.get(9)),
-                notes=str(row.get(10, "")).strip(),
-                basic_flag=parse_float(row.get(11)),
-                per_hit_multipliers=[
-                    x
-                    for x in (
-                        parse_optional_float(row.get(col))
-                        for col in range(12, 32)
-                    )
-                    if x is not None
-                ],
+                sp=parse_float(row[8]),
+                multiplier=parse_float(row[9]),
+                notes=row[10],
+                basic_flag=parse_float(row[11]),
+                per_hit_multipliers=array(
+                    "d", [x for cell in row[12:32] if (x := optional_float(cell)) is not None]
+                ),
             )
             skills.append(skill)
 
@@ -315,36 +430,36 @@ class XlsxExtractor:
     def parse_enemies(self) -> list[Enemy]:
         enemies: list[Enemy] = []
 
-        for rnum, row in self.iter_sheet_rows("仮想敵"):
+        for rnum, row in self.iter_sheet_rows("仮想敵", 18):
             if rnum < 2:
                 continue
 
-            name = str(row.get(1, "")).strip()
+            name = row[1]
             if not name:
                 continue
 
             weapon_mult = {
-                "斬": parse_float(row.get(9), 1.0),
-                "突": parse_float(row.get(10), 1.0),
-                "打": parse_float(row.get(11), 1.0),
+                "斬": parse_float(row[9], 1.0),
+                "突": parse_float(row[10], 1.0),
+                "打": parse_float(row[11], 1.0),
             }
             element_mult = {
-                "火": parse_float(row.get(12), 1.0),
-                "氷": parse_float(row.get(13), 1.0),
-                "雷": parse_float(row.get(14), 1.0),
-                "光": parse_float(row.get(15), 1.0),
-                "闇": parse_float(row.get(16), 1.0),
-                "無": parse_float(row.get(17), 1.0),
+                "火": parse_float(row[12], 1.0),
+                "氷": parse_float(row[13], 1.0),
+                "雷": parse_float(row[14], 1.0),
+                "光": parse_float(row[15], 1.0),
+                "闇": parse_float(row[16], 1.0),
+                "無": parse_float(row[17], 1.0),
             }
 
             enemy = Enemy(
                 name=name,
-                dp=parse_float(row.get(2)),
-                hp=parse_float(row.get(3)),
-                dr=parse_float(row.get(4)),
-                stat=parse_float(row.get(6)),
-                category=str(row.get(7, "")).strip(),
-                detail_url=str(row.get(8, "")).strip(),
+                dp=parse_float(row[2]),
+                hp=parse_float(row[3]),
+                dr=parse_float(row[4]),
+                stat=parse_float(row[6]),
+                category=row[7],
+                detail_url=row[8],
                 weapon_mult=weapon_mult,
                 element_mult=element_mult,
             )
@@ -352,48 +467,50 @@ class XlsxExtractor:
 
         return enemies
 
-    def _row_text(self, row: dict[int, str], col: int) -> str:
-        return str(row.get(col, "")).strip()
-
     def _has_real_value(self, text: str) -> bool:
         if not text:
             return False
         return not text.startswith("=")
 
     def parse_knowledge_tables(self) -> dict[str, Any]:
-        return {
-            "version": self.parse_version_info(),
-            "manual_notes": self.parse_manual_notes(),
-            "skill_attack_buffs": self.parse_skill_attack_buffs(),
-            "element_attack_buffs": self.parse_element_attack_buffs(),
-            "charge_buffs": self.parse_charge_buffs(),
-            "crit_damage_buffs": self.parse_crit_damage_buffs(),
-            "crit_rate_buffs": self.parse_crit_rate_buffs(),
-            "debuff_traits": self.parse_debuff_traits(),
-            "field_buffs": self.parse_field_buffs(),
-            "mind_eye_buffs": self.parse_mind_eye_buffs(),
-            "penetration_skills": self.parse_penetration_skills(),
-        }
+        # The tables live on independent sheets; inflate/parse them on a few
+        # threads. Keys keep this fixed order so the JSON output is stable.
+        tasks = [
+            ("version", self.parse_version_info),
+            ("manual_notes", self.parse_manual_notes),
+            ("skill_attack_buffs", self.parse_skill_attack_buffs),
+            ("element_attack_buffs", self.parse_element_attack_buffs),
+            ("charge_buffs", self.parse_charge_buffs),
+            ("crit_damage_buffs", self.parse_crit_damage_buffs),
+            ("crit_rate_buffs", self.parse_crit_rate_buffs),
+            ("debuff_traits", self.parse_debuff_traits),
+            ("field_buffs", self.parse_field_buffs),
+            ("mind_eye_buffs", self.parse_mind_eye_buffs),
+            ("penetration_skills", self.parse_penetration_skills),
+        ]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [(key, pool.submit(fn)) for key, fn in tasks]
+            return {key: future.result() for key, future in futures}
 
     def parse_version_info(self) -> dict[str, str]:
         out: dict[str, str] = {}
-        for rnum, row in self.iter_sheet_rows("更新履歴"):
+        for rnum, row in self.iter_sheet_rows("更新履歴", 5):
             if rnum == 1:
-                out["tool_version"] = self._row_text(row, 4)
+                out["tool_version"] = row[4]
             elif rnum == 3:
-                out["tool_name"] = self._row_text(row, 2)
+                out["tool_name"] = row[2]
             elif rnum == 4:
-                out["source_sheet"] = self._row_text(row, 1)
+                out["source_sheet"] = row[1]
             if rnum > 4:
                 break
         return out
 
     def parse_manual_notes(self) -> list[str]:
         notes: list[str] = []
-        for rnum, row in self.iter_sheet_rows("マニュアル"):
+        for rnum, row in self.iter_sheet_rows("マニュアル", 2):
             if rnum > 120:
                 break
-            text = self._row_text(row, 1)
+            text = row[1]
             if not text or text.startswith("="):
                 continue
             notes.append(text)
@@ -401,189 +518,189 @@ class XlsxExtractor:
 
     def parse_skill_attack_buffs(self) -> list[dict[str, Any]]:
         out: list[dict[str, Any]] = []
-        for rnum, row in self.iter_sheet_rows("スキル攻撃バフ"):
+        for rnum, row in self.iter_sheet_rows("スキル攻撃バフ", 10):
             if rnum < 3:
                 continue
-            skill_name = self._row_text(row, 1)
+            skill_name = row[1]
             if not self._has_real_value(skill_name):
                 continue
             out.append(
                 {
                     "skill_name": skill_name,
-                    "threshold": parse_float(row.get(2)),
-                    "min_value": parse_float(row.get(3)),
-                    "max_value": parse_float(row.get(4)),
-                    "jewel_cap": parse_float(row.get(5)),
-                    "lv_cap": parse_float(row.get(6)),
-                    "precast": parse_float(row.get(7)),
-                    "user": self._row_text(row, 8),
-                    "style_hint": self._row_text(row, 9),
+                    "threshold": parse_float(row[2]),
+                    "min_value": parse_float(row[3]),
+                    "max_value": parse_float(row[4]),
+                    "jewel_cap": parse_float(row[5]),
+                    "lv_cap": parse_float(row[6]),
+                    "precast": parse_float(row[7]),
+                    "user": row[8],
+                    "style_hint": row[9],
                 }
             )
         return out
 
     def parse_element_attack_buffs(self) -> list[dict[str, Any]]:
         out: list[dict[str, Any]] = []
-        for rnum, row in self.iter_sheet_rows("属性攻撃バフ"):
+        for rnum, row in self.iter_sheet_rows("属性攻撃バフ", 11):
             if rnum < 3:
                 continue
-            skill_name = self._row_text(row, 1)
+            skill_name = row[1]
             if not self._has_real_value(skill_name):
                 continue
             out.append(
                 {
                     "skill_name": skill_name,
-                    "threshold": parse_float(row.get(2)),
-                    "min_value": parse_float(row.get(3)),
-                    "max_value": parse_float(row.get(4)),
-                    "jewel_cap": parse_float(row.get(5)),
-                    "lv_cap": parse_float(row.get(6)),
-                    "element": self._row_text(row, 7),
-                    "precast": parse_float(row.get(8)),
-                    "user": self._row_text(row, 9),
-                    "style_hint": self._row_text(row, 10),
+                    "threshold": parse_float(row[2]),
+                    "min_value": parse_float(row[3]),
+                    "max_value": parse_float(row[4]),
+                    "jewel_cap": parse_float(row[5]),
+                    "lv_cap": parse_float(row[6]),
+                    "element": row[7],
+                    "precast": parse_float(row[8]),
+                    "user": row[9],
+                    "style_hint": row[10],
                 }
             )
         return out
 
     def parse_charge_buffs(self) -> list[dict[str, Any]]:
         out: list[dict[str, Any]] = []
-        for rnum, row in self.iter_sheet_rows("チャージバフ"):
+        for rnum, row in self.iter_sheet_rows("チャージバフ", 9):
             if rnum < 3:
                 continue
-            skill_name = self._row_text(row, 1)
+            skill_name = row[1]
             if not self._has_real_value(skill_name):
                 continue
             out.append(
                 {
                     "skill_name": skill_name,
-                    "threshold": parse_float(row.get(2)),
-                    "min_value": parse_float(row.get(3)),
-                    "max_value": parse_float(row.get(4)),
-                    "jewel_cap": parse_float(row.get(5)),
-                    "lv_cap": parse_float(row.get(6)),
-                    "user": self._row_text(row, 7),
-                    "style_hint": self._row_text(row, 8),
+                    "threshold": parse_float(row[2]),
+                    "min_value": parse_float(row[3]),
+                    "max_value": parse_float(row[4]),
+                    "jewel_cap": parse_float(row[5]),
+                    "lv_cap": parse_float(row[6]),
+                    "user": row[7],
+                    "style_hint": row[8],
                 }
             )
         return out
 
     def parse_crit_damage_buffs(self) -> list[dict[str, Any]]:
         out: list[dict[str, Any]] = []
-        for rnum, row in self.iter_sheet_rows("クリ威力"):
+        for rnum, row in self.iter_sheet_rows("クリ威力", 6):
             if rnum < 3:
                 continue
-            skill_name = self._row_text(row, 1)
+            skill_name = row[1]
             if not self._has_real_value(skill_name):
                 continue
             out.append(
                 {
                     "skill_name": skill_name,
-                    "value": parse_float(row.get(2)),
-                    "element": self._row_text(row, 3),
-                    "precast": parse_float(row.get(4)),
-                    "user": self._row_text(row, 5),
+                    "value": parse_float(row[2]),
+                    "element": row[3],
+                    "precast": parse_float(row[4]),
+                    "user": row[5],
                 }
             )
         return out
 
     def parse_crit_rate_buffs(self) -> list[dict[str, Any]]:
         out: list[dict[str, Any]] = []
-        for rnum, row in self.iter_sheet_rows("クリバフ"):
+        for rnum, row in self.iter_sheet_rows("クリバフ", 8):
             if rnum < 3:
                 continue
-            skill_name = self._row_text(row, 1)
+            skill_name = row[1]
             if not self._has_real_value(skill_name):
                 continue
             out.append(
                 {
                     "skill_name": skill_name,
-                    "threshold": parse_float(row.get(2)),
-                    "min_value": parse_float(row.get(3)),
-                    "max_value": parse_float(row.get(4)),
-                    "jewel_cap": parse_float(row.get(5)),
-                    "lv_cap": parse_float(row.get(6)),
-                    "user": self._row_text(row, 7),
+                    "threshold": parse_float(row[2]),
+                    "min_value": parse_float(row[3]),
+                    "max_value": parse_float(row[4]),
+                    "jewel_cap": parse_float(row[5]),
+                    "lv_cap": parse_float(row[6]),
+                    "user": row[7],
                 }
             )
         return out
 
     def parse_debuff_traits(self) -> list[dict[str, Any]]:
         out: list[dict[str, Any]] = []
-        for rnum, row in self.iter_sheet_rows("デバフ特性"):
+        for rnum, row in self.iter_sheet_rows("デバフ特性", 9):
             if rnum < 3:
                 continue
-            skill_name = self._row_text(row, 1)
+            skill_name = row[1]
             if not self._has_real_value(skill_name):
                 continue
             out.append(
                 {
                     "skill_name": skill_name,
-                    "jewel_cap": parse_float(row.get(2)),
-                    "attribute": self._row_text(row, 3),
-                    "lv": parse_float(row.get(4)),
-                    "resistance": self._row_text(row, 5),
-                    "effect_type": self._row_text(row, 6),
-                    "user": self._row_text(row, 7),
-                    "style_hint": self._row_text(row, 8),
+                    "jewel_cap": parse_float(row[2]),
+                    "attribute": row[3],
+                    "lv": parse_float(row[4]),
+                    "resistance": row[5],
+                    "effect_type": row[6],
+                    "user": row[7],
+                    "style_hint": row[8],
                 }
             )
         return out
 
     def parse_field_buffs(self) -> list[dict[str, Any]]:
         out: list[dict[str, Any]] = []
-        for rnum, row in self.iter_sheet_rows("属性フィールド"):
+        for rnum, row in self.iter_sheet_rows("属性フィールド", 6):
             if rnum < 3:
                 continue
-            skill_name = self._row_text(row, 1)
+            skill_name = row[1]
             if not self._has_real_value(skill_name):
                 continue
             out.append(
                 {
                     "skill_name": skill_name,
-                    "element": self._row_text(row, 2),
-                    "value": parse_float(row.get(3)),
-                    "user": self._row_text(row, 4),
-                    "style_hint": self._row_text(row, 5),
+                    "element": row[2],
+                    "value": parse_float(row[3]),
+                    "user": row[4],
+                    "style_hint": row[5],
                 }
             )
         return out
 
     def parse_mind_eye_buffs(self) -> list[dict[str, Any]]:
         out: list[dict[str, Any]] = []
-        for rnum, row in self.iter_sheet_rows("心眼"):
+        for rnum, row in self.iter_sheet_rows("心眼", 10):
             if rnum < 3:
                 continue
-            skill_name = self._row_text(row, 1)
+            skill_name = row[1]
             if not self._has_real_value(skill_name):
                 continue
             out.append(
                 {
                     "skill_name": skill_name,
-                    "threshold": parse_float(row.get(2)),
-                    "min_value": parse_float(row.get(3)),
-                    "max_value": parse_float(row.get(4)),
-                    "jewel_cap": parse_float(row.get(5)),
-                    "lv_cap": parse_float(row.get(6)),
-                    "user": self._row_text(row, 7),
-                    "default_select": parse_float(row.get(8)),
-                    "style_hint": self._row_text(row, 9),
+                    "threshold": parse_float(row[2]),
+                    "min_value": parse_float(row[3]),
+                    "max_value": parse_float(row[4]),
+                    "jewel_cap": parse_float(row[5]),
+                    "lv_cap": parse_float(row[6]),
+                    "user": row[7],
+                    "default_select": parse_float(row[8]),
+                    "style_hint": row[9],
                 }
             )
         return out
 
     def parse_penetration_skills(self) -> list[dict[str, Any]]:
         out: list[dict[str, Any]] = []
-        for rnum, row in self.iter_sheet_rows("貫通"):
+        for rnum, row in self.iter_sheet_rows("貫通", 3):
             if rnum < 2:
                 continue
-            skill_name = self._row_text(row, 1)
+            skill_name = row[1]
             if not self._has_real_value(skill_name):
                 continue
             out.append(
                 {
                     "skill_name": skill_name,
-                    "value": parse_float(row.get(2)),
+                    "value": parse_float(row[2]),
                 }
             )
         return out
@@ -592,21 +709,27 @@ class XlsxExtractor:
 def build_workbook_data(xlsx_path: str | Path) -> WorkbookData:
     extractor = XlsxExtractor(xlsx_path)
     try:
-        return WorkbookData(
-            styles=extractor.parse_styles(),
-            skills=extractor.parse_skills(),
-            enemies=extractor.parse_enemies(),
-            knowledge=extractor.parse_knowledge_tables(),
-        )
+        # Every sheet is read by exactly one pass, so rows are streamed uncached.
+        styles = extractor.parse_styles()
+        skills = extractor.parse_skills()
+        enemies = extractor.parse_enemies()
+        knowledge = extractor.parse_knowledge_tables()
+        return WorkbookData(styles=styles, skills=skills, enemies=enemies, knowledge=knowledge)
     finally:
         extractor.close()
 
 
 def build_json_dataset(xlsx_path: str | Path, out_path: str | Path) -> dict[str, Any]:
+    """Write the workbook as a JSON dataset and return the payload dict.
+
+    The payload tree is still built in full (it is returned), but it is
+    serialized one top-level section at a time, so the encoded document is
+    never held in memory as a whole.
+    """
     data = build_workbook_data(xlsx_path)
     payload = data.to_dict()
 
     out = Path(out_path)
     out.parent.mkdir(parents=True, exist_ok=True)
-    out.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    write_json_sections(out, payload.items())
     return payload
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Iterable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
+
+
+def loads_json(raw: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def dumps_json(payload: Any) -> bytes:
+    """Serialize as indented UTF-8 JSON (non-ASCII kept as-is)."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def dumps_json_compact(payload: Any) -> bytes:
+    """Serialize as single-line UTF-8 JSON (for inline embedding)."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def write_json(path: Path, payload: Any) -> None:
+    """Write ``payload`` as indented UTF-8 JSON without an intermediate ``str``."""
+    if orjson is not None:
+        with path.open("wb") as fh:
+            fh.write(dumps_json(payload))
+        return
+    with path.open("w", encoding="utf-8", buffering=1 << 20) as fh:
+        json.dump(payload, fh, ensure_ascii=False, indent=2)
+
+
+def write_json_sections(path: Path, sections: Iterable[tuple[str, Any]]) -> None:
+    """Write a top-level JSON object one ``(key, value)`` section at a time.
+
+    The bytes match ``write_json`` on the equivalent dict, but only one
+    section's serialized form is held in memory at once.
+    """
+    with path.open("wb") as fh:
+        sep = b"{\n  "
+        for key, value in sections:
+            fh.write(sep)
+            sep = b",\n  "
+            # Encoded strings never contain a raw newline, so re-indenting the
+            # nested document is a plain replace.
+            fh.write(dumps_json(key))
+            fh.write(b": ")
+            fh.write(dumps_json(value).replace(b"\n", b"\n  "))
+        fh.write(b"{}" if sep == b"{\n  " else b"\n}")
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass, field
+from array import array
+from dataclasses import dataclass, field
 from typing import Any, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Style:
     style_name: str
     alias: str
@@ -57,10 +58,40 @@ class Style:
         return max(self.def_bonus_no_lb, self.def_bonus_lb3)
 
     def to_dict(self) -> dict[str, Any]:
-        return asdict(self)
-
-
-@dataclass
+        return {
+            "style_name": self.style_name,
+            "alias": self.alias,
+            "character": self.character,
+            "style_raw": self.style_raw,
+            "rarity": self.rarity,
+            "attack_bonus_no_lb": self.attack_bonus_no_lb,
+            "attack_bonus_lb3": self.attack_bonus_lb3,
+            "crit_damage_no_lb": self.crit_damage_no_lb,
+            "crit_damage_lb3": self.crit_damage_lb3,
+            "crit_rate_no_lb": self.crit_rate_no_lb,
+            "crit_rate_lb3": self.crit_rate_lb3,
+            "destruction_no_lb": self.destruction_no_lb,
+            "destruction_lb3": self.destruction_lb3,
+            "passive_no_lb": self.passive_no_lb,
+            "passive_lb3": self.passive_lb3,
+            "element_tag": self.element_tag,
+            "jewel_type": self.jewel_type,
+            "def_bonus_no_lb": self.def_bonus_no_lb,
+            "def_bonus_lb3": self.def_bonus_lb3,
+            "attack_scope_no_lb": self.attack_scope_no_lb,
+            "def_scope_no_lb": self.def_scope_no_lb,
+            "crit_damage_scope_no_lb": self.crit_damage_scope_no_lb,
+            "crit_rate_scope_no_lb": self.crit_rate_scope_no_lb,
+            "destruction_scope_no_lb": self.destruction_scope_no_lb,
+            "attack_scope_lb3": self.attack_scope_lb3,
+            "def_scope_lb3": self.def_scope_lb3,
+            "crit_damage_scope_lb3": self.crit_damage_scope_lb3,
+            "crit_rate_scope_lb3": self.crit_rate_scope_lb3,
+            "destruction_scope_lb3": self.destruction_scope_lb3,
+        }
+
+
+@dataclass(slots=True)
 class Skill:
     skill_name: str
     weapon: str
@@ -73,13 +104,31 @@ class Skill:
     multiplier: float
     notes: str
     basic_flag: float
-    per_hit_multipliers: list[float] = field(default_factory=list)
-
-    def to_dict(self) -> dict[str, Any]:
-        return asdict(self)
+    per_hit_multipliers: array[float] = field(default_factory=lambda: array("d"))
 
+    def __post_init__(self) -> None:
+        # Stored as a packed double array; loaders may pass a plain list.
+        if type(self.per_hit_multipliers) is not array:
+            self.per_hit_multipliers = array("d", self.per_hit_multipliers)
 
-@dataclass
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "skill_name": self.skill_name,
+            "weapon": self.weapon,
+            "element": self.element,
+            "target": self.target,
+            "hit": self.hit,
+            "owner_style_hint": self.owner_style_hint,
+            "owner_character": self.owner_character,
+            "sp": self.sp,
+            "multiplier": self.multiplier,
+            "notes": self.notes,
+            "basic_flag": self.basic_flag,
+            "per_hit_multipliers": list(self.per_hit_multipliers),
+        }
+
+
+@dataclass(slots=True)
 class Enemy:
     name: str
     dp: float
@@ -92,10 +141,20 @@ class Enemy:
     element_mult: dict[str, float]
 
     def to_dict(self) -> dict[str, Any]:
-        return asdict(self)
-
-
-@dataclass
+        return {
+            "name": self.name,
+            "dp": self.dp,
+            "hp": self.hp,
+            "dr": self.dr,
+            "stat": self.stat,
+            "category": self.category,
+            "detail_url": self.detail_url,
+            "weapon_mult": dict(self.weapon_mult),
+            "element_mult": dict(self.element_mult),
+        }
+
+
+@dataclass(slots=True)
 class StyleScore:
     style: Style
     role: str
@@ -110,7 +169,7 @@ class StyleScore:
     weakness_factor: float
 
 
-@dataclass
+@dataclass(slots=True)
 class TeamPlan:
     team: list[StyleScore]
     main_attacker: Optional[StyleScore]
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+import copy
 import difflib
+import functools
+import heapq
 import re
 from collections import defaultdict
-from typing import Any, Iterable, Optional
+from itertools import accumulate
+from operator import attrgetter
+from typing import Any, Callable, Iterable, Iterator, Optional
 
 from .models import Enemy, Skill, Style, StyleScore, TeamPlan
 from .utils import extract_percent_values, rarity_score
 
 
-SUPPORT_KEYWORDS = [
+SUPPORT_KEYWORDS = (
     "バフ",
     "フィールド",
     "チャージ",
@@ -19,17 +24,46 @@ SUPPORT_KEYWORDS = [
     "トークン",
     "OD",
     "SP",
-]
-DEBUFF_KEYWORDS = ["防御ダウン", "脆弱", "耐性", "デバフ", "被ダメ", "弱体", "封印"]
-ATTACK_KEYWORDS = ["対HPダメージ", "対DPダメージ", "連撃", "破壊率", "貫通"]
+)
+DEBUFF_KEYWORDS = ("防御ダウン", "脆弱", "耐性", "デバフ", "被ダメ", "弱体", "封印")
+ATTACK_KEYWORDS = ("対HPダメージ", "対DPダメージ", "連撃", "破壊率", "貫通")
+
+
+def _keyword_re(keywords: tuple[str, ...]) -> re.Pattern[str]:
+    # Zero-width lookahead so overlapping keywords are all reported; a set of
+    # the hits equals the old per-keyword `k in text` checks as long as no
+    # keyword is a prefix of another in the same list.
+    return re.compile("(?=(" + "|".join(map(re.escape, keywords)) + "))")
+
+
+_SUPPORT_RE = _keyword_re(SUPPORT_KEYWORDS)
+_DEBUFF_RE = _keyword_re(DEBUFF_KEYWORDS)
+_ATTACK_RE = _keyword_re(ATTACK_KEYWORDS)
+_SPLIT_RE = re.compile(r"[\n,、]+")
+# 0.07 per attack keyword, accumulated step by step like the original loop.
+_ATTACK_KEYWORD_BONUS = list(accumulate([0.07] * len(ATTACK_KEYWORDS), initial=0.0))
+
+
+def _count_keywords(pattern: re.Pattern[str], text: str) -> int:
+    return len(set(pattern.findall(text)))
+
+
+def _iter_descending(items: list[StyleScore], key: Callable[[StyleScore], float]) -> Iterator[StyleScore]:
+    """Yield ``items`` in ``sorted(items, key=key, reverse=True)`` order, lazily.
+
+    The selection loops usually stop after a few picks, so heapify once and pop
+    on demand instead of fully sorting; the index keeps ties in input order.
+    """
+    heap = [(-key(x), i, x) for i, x in enumerate(items)]
+    heapq.heapify(heap)
+    while heap:
+        yield heapq.heappop(heap)[2]
 
 
 def split_style_input(raw: str) -> list[str]:
     if not raw:
         return []
-    parts = re.split(r"[\n,、]+", raw)
-    out = [p.strip() for p in parts if p.strip()]
-    return out
+    return [s for s in (p.strip() for p in _SPLIT_RE.split(raw)) if s]
 
 
 class BattleAdvisor:
@@ -45,8 +79,27 @@ class BattleAdvisor:
         self.enemies = enemies
         self.knowledge = knowledge if isinstance(knowledge, dict) else {}
         self.style_by_name = {s.style_name: s for s in styles}
+        self._all_names = list(self.style_by_name.keys())
+        self._lower_map = {name.lower(): name for name in self._all_names}
+        self._fuzzy_match = functools.lru_cache(maxsize=1024)(self._fuzzy_match_uncached)
+        self._enemy_by_name: dict[str, Enemy] = {}
+        for e in enemies:
+            # First entry wins on duplicate names, as with the old linear scan.
+            self._enemy_by_name.setdefault(e.name, e)
+        self._enemy_index = {id(e): i for i, e in enumerate(enemies)}
+        # Style scores only depend on the style, enemy and preferences, so
+        # repeated recommend calls (e.g. tweaking owned/wanted lists in the UI)
+        # reuse them. Call cache_clear() on both if the knowledge maps change.
+        self._score_style_cached = functools.lru_cache(maxsize=2048)(
+            self._score_style_by_key
+        )
+        self._weakness_table = functools.lru_cache(maxsize=64)(self._new_weakness_table)
         self.skills_by_character: dict[str, list[Skill]] = defaultdict(list)
         self.skills_by_style_hint: dict[str, list[Skill]] = defaultdict(list)
+        self._style_skills_cache: dict[tuple[str, str, str], list[Skill]] = {}
+        self._style_rows_cache: dict[
+            tuple[str, str, str], list[tuple[Skill, float, float, float, float]]
+        ] = {}
 
         # Structured knowledge extracted from workbook tables.
         self.skill_attack_buff_map = self._build_skill_value_map(
@@ -64,6 +117,22 @@ class BattleAdvisor:
         self.mind_eye_map = self._build_skill_value_map("mind_eye_buffs", "max_value")
         self.penetration_map = self._build_skill_value_map("penetration_skills", "value")
         self.debuff_trait_map = self._build_debuff_trait_map()
+        # Any skill listed in a buff table marks its style as a buffer.
+        self._buff_skill_names = frozenset().union(
+            self.skill_attack_buff_map,
+            self.element_attack_buff_map,
+            self.charge_buff_map,
+            self.field_buff_map,
+            self.crit_damage_buff_map,
+            self.crit_rate_buff_map,
+        )
+
+        # Skill-only score parts (hp_base, dp_base, support, debuff), keyed by
+        # id(skill). They do not depend on the enemy or preferences, so they
+        # are precomputed once from the (immutable) skills and knowledge maps.
+        self._skill_features: dict[int, tuple[float, float, float, float]] = {
+            id(sk): self._compute_skill_features(sk) for sk in skills
+        }
 
         for sk in skills:
             self.skills_by_character[sk.owner_character].append(sk)
@@ -114,9 +183,9 @@ class BattleAdvisor:
     def find_enemy(self, enemy_name: str | None) -> Optional[Enemy]:
         if not enemy_name:
             return None
-        for e in self.enemies:
-            if e.name == enemy_name:
-                return e
+        exact = self._enemy_by_name.get(enemy_name)
+        if exact is not None:
+            return exact
         for e in self.enemies:
             if enemy_name in e.name:
                 return e
@@ -126,8 +195,7 @@ class BattleAdvisor:
         resolved: list[Style] = []
         unresolved: list[str] = []
 
-        all_names = list(self.style_by_name.keys())
-        lower_map = {name.lower(): name for name in all_names}
+        lower_map = self._lower_map
 
         for query in queries:
             q = query.strip()
@@ -162,9 +230,9 @@ class BattleAdvisor:
                 continue
 
             # Fuzzy
-            fuzzy = difflib.get_close_matches(q, all_names, n=1, cutoff=0.5)
-            if fuzzy:
-                resolved.append(self.style_by_name[fuzzy[0]])
+            fuzzy = self._fuzzy_match(q)
+            if fuzzy is not None:
+                resolved.append(self.style_by_name[fuzzy])
                 continue
 
             unresolved.append(q)
@@ -180,7 +248,32 @@ class BattleAdvisor:
 
         return uniq, unresolved
 
+    def _fuzzy_match_uncached(self, query: str) -> Optional[str]:
+        matches = difflib.get_close_matches(query, self._all_names, n=1, cutoff=0.5)
+        return matches[0] if matches else None
+
     def _skills_for_style(self, style: Style) -> list[Skill]:
+        # Keyed on every field the lookup reads, so same-named styles with a
+        # different character/alias never share an entry.
+        key = (style.style_name, style.character, style.alias)
+        cached = self._style_skills_cache.get(key)
+        if cached is None:
+            cached = self._style_skills_cache[key] = self._find_skills_for_style(style)
+        return cached
+
+    def _skill_rows_for_style(
+        self, style: Style
+    ) -> list[tuple[Skill, float, float, float, float]]:
+        """(skill, hp_base, dp_base, support, debuff) rows for the style's skills."""
+        key = (style.style_name, style.character, style.alias)
+        rows = self._style_rows_cache.get(key)
+        if rows is None:
+            rows = self._style_rows_cache[key] = [
+                (sk, *self._features(sk)) for sk in self._skills_for_style(style)
+            ]
+        return rows
+
+    def _find_skills_for_style(self, style: Style) -> list[Skill]:
         style_skills = self.skills_by_style_hint.get(style.style_name, [])
         if style_skills:
             return style_skills
@@ -196,9 +289,10 @@ class BattleAdvisor:
 
         return self.skills_by_character.get(style.character, [])
 
-    def _weakness_factor(
+    def _weakness(
         self,
-        skill: Skill,
+        weapon: str,
+        element: str,
         enemy: Optional[Enemy],
         preferred_weapon: str | None,
         preferred_element: str | None,
@@ -206,55 +300,63 @@ class BattleAdvisor:
         factor = 1.0
 
         if enemy is not None:
-            if skill.weapon in enemy.weapon_mult:
-                factor *= max(0.05, enemy.weapon_mult[skill.weapon])
-            if skill.element in enemy.element_mult:
-                factor *= max(0.05, enemy.element_mult[skill.element])
+            if weapon in enemy.weapon_mult:
+                factor *= max(0.05, enemy.weapon_mult[weapon])
+            if element in enemy.element_mult:
+                factor *= max(0.05, enemy.element_mult[element])
 
-        if preferred_weapon and skill.weapon == preferred_weapon:
+        if preferred_weapon and weapon == preferred_weapon:
             factor *= 1.15
-        if preferred_element and skill.element == preferred_element:
+        if preferred_element and element == preferred_element:
             factor *= 1.2
 
         return factor
 
-    def _attack_skill_score(
-        self,
-        skill: Skill,
-        enemy: Optional[Enemy],
-        preferred_weapon: str | None,
-        preferred_element: str | None,
-    ) -> tuple[float, float, float, float]:
-        weakness = self._weakness_factor(skill, enemy, preferred_weapon, preferred_element)
+    def _features(self, skill: Skill) -> tuple[float, float, float, float]:
+        feat = self._skill_features.get(id(skill))
+        if feat is None:
+            # Not one of self.skills: computed on the fly and not cached, since
+            # the id of a foreign object may be reused once it is freed.
+            feat = self._compute_skill_features(skill)
+        return feat
+
+    def _compute_skill_features(self, skill: Skill) -> tuple[float, float, float, float]:
+        hp_base, dp_base = self._compute_attack_base(skill)
+        return (
+            hp_base,
+            dp_base,
+            self._compute_support_score(skill),
+            self._compute_debuff_score(skill),
+        )
 
+    def _compute_attack_base(self, skill: Skill) -> tuple[float, float]:
         notes = skill.notes or ""
         hp_bonus = 0.0
         dp_bonus = 0.0
-        pct_values = extract_percent_values(notes)
-        if "対HPダメージ" in notes and pct_values:
-            hp_bonus = max(pct_values)
-        if "対DPダメージ" in notes and pct_values:
-            dp_bonus = max(pct_values)
-
-        attack_keyword_bonus = 0.0
-        for k in ATTACK_KEYWORDS:
-            if k in notes:
-                attack_keyword_bonus += 0.07
+        has_hp = "対HPダメージ" in notes
+        has_dp = "対DPダメージ" in notes
+        if has_hp or has_dp:
+            pct_values = extract_percent_values(notes)
+            if pct_values:
+                top = max(pct_values)
+                if has_hp:
+                    hp_bonus = top
+                if has_dp:
+                    dp_bonus = top
+
+        attack_keyword_bonus = _ATTACK_KEYWORD_BONUS[_count_keywords(_ATTACK_RE, notes)]
 
         base = max(0.1, skill.multiplier)
         penetration_bonus = self.penetration_map.get(skill.skill_name, 0.0) * 0.65
         mind_eye_bonus = self.mind_eye_map.get(skill.skill_name, 0.0) * 0.4
-        hp_score = base * (1.0 + hp_bonus + attack_keyword_bonus + penetration_bonus + mind_eye_bonus) * weakness
-        dp_score = base * (1.0 + dp_bonus + attack_keyword_bonus + penetration_bonus + mind_eye_bonus) * weakness
-        overall = max(hp_score, dp_score)
-        return overall, hp_score, dp_score, weakness
+        return (
+            base * (1.0 + hp_bonus + attack_keyword_bonus + penetration_bonus + mind_eye_bonus),
+            base * (1.0 + dp_bonus + attack_keyword_bonus + penetration_bonus + mind_eye_bonus),
+        )
 
-    def _support_skill_score(self, skill: Skill) -> float:
+    def _compute_support_score(self, skill: Skill) -> float:
         notes = skill.notes or ""
-        score = 0.0
-        for k in SUPPORT_KEYWORDS:
-            if k in notes:
-                score += 1.0
+        score = float(_count_keywords(_SUPPORT_RE, notes))
         if "回復" in notes:
             score += 0.4
         score += self.skill_attack_buff_map.get(skill.skill_name, 0.0) * 10.0
@@ -265,12 +367,9 @@ class BattleAdvisor:
         score += self.field_buff_map.get(skill.skill_name, 0.0) * 8.0
         return score
 
-    def _debuff_skill_score(self, skill: Skill) -> float:
+    def _compute_debuff_score(self, skill: Skill) -> float:
         notes = skill.notes or ""
-        score = 0.0
-        for k in DEBUFF_KEYWORDS:
-            if k in notes:
-                score += 1.0
+        score = float(_count_keywords(_DEBUFF_RE, notes))
         debuff_hint = self.debuff_trait_map.get(skill.skill_name, "")
         if debuff_hint:
             score += 2.0
@@ -284,14 +383,44 @@ class BattleAdvisor:
             score += 1.0
         return score
 
+    def _new_weakness_table(
+        self,
+        enemy_idx: Optional[int],
+        preferred_weapon: str | None,
+        preferred_element: str | None,
+    ) -> dict[tuple[str, str], float]:
+        return {}
+
+    def _score_style_by_key(
+        self,
+        style_name: str,
+        enemy_idx: Optional[int],
+        preferred_weapon: str | None,
+        preferred_element: str | None,
+    ) -> StyleScore:
+        enemy = self.enemies[enemy_idx] if enemy_idx is not None else None
+        return self.score_style(
+            self.style_by_name[style_name],
+            enemy,
+            preferred_weapon,
+            preferred_element,
+            self._weakness_table(enemy_idx, preferred_weapon, preferred_element),
+        )
+
     def score_style(
         self,
         style: Style,
         enemy: Optional[Enemy],
         preferred_weapon: str | None,
         preferred_element: str | None,
+        weakness_by_we: Optional[dict[tuple[str, str], float]] = None,
     ) -> StyleScore:
-        skills = self._skills_for_style(style)
+        rows = self._skill_rows_for_style(style)
+        # The factor only depends on weapon/element for a fixed enemy and
+        # preferences, so skills sharing them reuse one computation. Callers
+        # scoring many styles against the same inputs may pass one dict in.
+        if weakness_by_we is None:
+            weakness_by_we = {}
 
         best_attack_any: Optional[Skill] = None
         best_attack_any_score = 0.0
@@ -307,10 +436,16 @@ class BattleAdvisor:
         best_debuff: Optional[Skill] = None
         best_debuff_score = 0.0
 
-        for sk in skills:
-            atk_any, atk_hp, atk_dp, weakness = self._attack_skill_score(
-                sk, enemy, preferred_weapon, preferred_element
-            )
+        for sk, hp_base, dp_base, sup_score, deb_score in rows:
+            we = (sk.weapon, sk.element)
+            weakness = weakness_by_we.get(we)
+            if weakness is None:
+                weakness = weakness_by_we[we] = self._weakness(
+                    sk.weapon, sk.element, enemy, preferred_weapon, preferred_element
+                )
+            atk_hp = hp_base * weakness
+            atk_dp = dp_base * weakness
+            atk_any = max(atk_hp, atk_dp)
             if atk_any > best_attack_any_score:
                 best_attack_any = sk
                 best_attack_any_score = atk_any
@@ -322,12 +457,10 @@ class BattleAdvisor:
                 best_dp_skill = sk
                 best_dp_score = atk_dp
 
-            sup_score = self._support_skill_score(sk)
             if sup_score > best_support_score:
                 best_support = sk
                 best_support_score = sup_score
 
-            deb_score = self._debuff_skill_score(sk)
             if deb_score > best_debuff_score:
                 best_debuff = sk
                 best_debuff_score = deb_score
@@ -355,20 +488,13 @@ class BattleAdvisor:
         debuff_score = (best_debuff_score + style.destruction_bonus * 2.0) * rarity
 
         passive_text = f"{style.passive_no_lb} {style.passive_lb3}"
-        if any(k in passive_text for k in SUPPORT_KEYWORDS):
+        if _SUPPORT_RE.search(passive_text):
             support_score += 0.8
-        if any(k in passive_text for k in DEBUFF_KEYWORDS):
+        if _DEBUFF_RE.search(passive_text):
             debuff_score += 0.8
 
         # Workbook derived tables are trusted first for role classification.
-        if best_support and (
-            best_support.skill_name in self.skill_attack_buff_map
-            or best_support.skill_name in self.element_attack_buff_map
-            or best_support.skill_name in self.charge_buff_map
-            or best_support.skill_name in self.field_buff_map
-            or best_support.skill_name in self.crit_damage_buff_map
-            or best_support.skill_name in self.crit_rate_buff_map
-        ):
+        if best_support and best_support.skill_name in self._buff_skill_names:
             role = "buffer"
         elif best_debuff and (
             best_debuff.skill_name in self.debuff_trait_map
@@ -416,7 +542,7 @@ class BattleAdvisor:
         if matched_owned:
             pool_map = {s.style_name: s for s in matched_owned}
         else:
-            pool_map = {s.style_name: s for s in self.styles}
+            pool_map = self.style_by_name.copy()
 
         # Wanted styles are always considered (even outside owned list)
         for st in matched_wanted:
@@ -425,9 +551,22 @@ class BattleAdvisor:
         pool = list(pool_map.values())
         enemy = self.find_enemy(enemy_name)
 
-        scores = [
-            self.score_style(st, enemy, preferred_weapon, preferred_element) for st in pool
-        ]
+        enemy_idx = self._enemy_index[id(enemy)] if enemy is not None else None
+        weakness_by_we = self._weakness_table(enemy_idx, preferred_weapon, preferred_element)
+        scores: list[StyleScore] = []
+        for st in pool:
+            if self.style_by_name.get(st.style_name) is st:
+                # Copied because the wanted bonus below mutates total_score.
+                sc = copy.copy(
+                    self._score_style_cached(
+                        st.style_name, enemy_idx, preferred_weapon, preferred_element
+                    )
+                )
+            else:
+                sc = self.score_style(
+                    st, enemy, preferred_weapon, preferred_element, weakness_by_we
+                )
+            scores.append(sc)
 
         wanted_names = {s.style_name for s in matched_wanted}
         for sc in scores:
@@ -437,12 +576,20 @@ class BattleAdvisor:
         score_map = {sc.style.style_name: sc for sc in scores}
         used_chars: set[str] = set()
         selected: list[StyleScore] = []
+        # Running tallies over `selected`, kept in step by add_style.
+        role_counts = {"attacker": 0, "buffer": 0, "debuffer": 0}
+        layer_counts = {"support": 0, "debuff": 0}
 
         def add_style(sc: StyleScore) -> bool:
             if sc.style.character in used_chars:
                 return False
             selected.append(sc)
             used_chars.add(sc.style.character)
+            role_counts[sc.role] = role_counts.get(sc.role, 0) + 1
+            if sc.support_score >= 2.0:
+                layer_counts["support"] += 1
+            if sc.debuff_score >= 2.0:
+                layer_counts["debuff"] += 1
             return True
 
         # 1) force-add wanted styles
@@ -452,7 +599,7 @@ class BattleAdvisor:
                 add_style(sc)
 
         # 2) main attacker
-        attackers = sorted(scores, key=lambda x: x.attack_score, reverse=True)
+        attackers = _iter_descending(scores, attrgetter("attack_score"))
         main_attacker: Optional[StyleScore] = None
         for sc in attackers:
             if add_style(sc):
@@ -461,46 +608,44 @@ class BattleAdvisor:
 
         # If main attacker was already wanted and inserted, pick it
         if main_attacker is None and selected:
-            main_attacker = max(selected, key=lambda x: x.attack_score)
+            main_attacker = max(selected, key=attrgetter("attack_score"))
 
         # 3) add top debuffers (at least one when available)
-        for sc in sorted(scores, key=lambda x: x.debuff_score, reverse=True):
+        for sc in _iter_descending(scores, attrgetter("debuff_score")):
             if len(selected) >= team_size:
                 break
             if sc.debuff_score <= 0.4:
                 break
             if add_style(sc):
-                if len([x for x in selected if x.role == "debuffer"]) >= 1:
+                if role_counts["debuffer"] >= 1:
                     break
 
         # 4) add top buffers (at least one when available)
-        for sc in sorted(scores, key=lambda x: x.support_score, reverse=True):
+        for sc in _iter_descending(scores, attrgetter("support_score")):
             if len(selected) >= team_size:
                 break
             if sc.support_score <= 0.4:
                 break
             if add_style(sc):
-                if len([x for x in selected if x.role == "buffer"]) >= 1:
+                if role_counts["buffer"] >= 1:
                     break
 
         # 4.5) optionally add second support layer/debuff layer
-        for sc in sorted(scores, key=lambda x: max(x.support_score, x.debuff_score), reverse=True):
+        for sc in _iter_descending(scores, lambda x: max(x.support_score, x.debuff_score)):
             if len(selected) >= team_size:
                 break
             if add_style(sc):
-                support_like = len([x for x in selected if x.support_score >= 2.0])
-                debuff_like = len([x for x in selected if x.debuff_score >= 2.0])
-                if support_like >= 2 and debuff_like >= 2:
+                if layer_counts["support"] >= 2 and layer_counts["debuff"] >= 2:
                     break
 
         # 5) fill with total score
-        for sc in sorted(scores, key=lambda x: x.total_score, reverse=True):
+        for sc in _iter_descending(scores, attrgetter("total_score")):
             if len(selected) >= team_size:
                 break
             add_style(sc)
 
         if main_attacker is None and selected:
-            main_attacker = max(selected, key=lambda x: x.attack_score)
+            main_attacker = max(selected, key=attrgetter("attack_score"))
 
         # Estimate damage
         estimated_damage = 0.0
@@ -563,10 +708,8 @@ class BattleAdvisor:
 
         # Place main attacker first for readability
         if main_attacker is not None:
-            selected = [
-                main_attacker,
-                *[x for x in selected if x.style.style_name != main_attacker.style.style_name],
-            ]
+            selected.remove(main_attacker)
+            selected.insert(0, main_attacker)
 
         return TeamPlan(
             team=selected[:team_size],
@@ -585,8 +728,8 @@ class BattleAdvisor:
         main_attacker: Optional[StyleScore],
         enemy: Optional[Enemy],
     ) -> list[str]:
-        debuffers = [x for x in team if x.debuff_skill is not None and x != main_attacker]
-        buffers = [x for x in team if x.support_skill is not None and x != main_attacker]
+        debuffers = [x for x in team if x.debuff_skill is not None and x is not main_attacker]
+        buffers = [x for x in team if x.support_skill is not None and x is not main_attacker]
         phase_has_dp = bool(enemy is not None and enemy.dp > 0)
 
         t1_actions: list[str] = []
@@ -1,25 +1,31 @@
 from __future__ import annotations
 
-import json
 import re
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from difflib import SequenceMatcher
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
 from typing import Any, Optional
 import unicodedata
 
 from .data_store import AdvisorData
+from .jsonio import dumps_json_compact, write_json
 from .models import Skill, Style
 from .utils import clean_style_raw
-from .web_lookup import StyleWebInfoResolver
+from .web_lookup import StyleWebInfo, StyleWebInfoResolver
+
+
+_SQUAD_RE = re.compile(r"(\d+)([A-Z])")
 
 
 def _squad_sort_key(squad: str) -> tuple[int, int, str]:
     text = (squad or "").strip()
     if not text:
         return (9, 999, "")
-    m = re.fullmatch(r"(\d+)([A-Z])", text)
+    m = _SQUAD_RE.fullmatch(text)
     if m:
         return (0, int(m.group(1)), m.group(2))
     if text == "司令部":
@@ -41,53 +47,101 @@ def _squad_id(squad: str) -> str:
     return f"squad::{squad}"
 
 
+_STYLE_TITLE_RE = re.compile(r"\(([^()]*)\)$")
+
+
+@lru_cache(maxsize=4096)
 def _style_title(style_name: str) -> str:
-    m = re.search(r"\(([^()]*)\)$", style_name or "")
+    m = _STYLE_TITLE_RE.search(style_name or "")
     if m:
         return m.group(1).strip()
     return (style_name or "").strip()
 
 
+@lru_cache(maxsize=4096)
 def _normalize_text(text: str) -> str:
-    s = unicodedata.normalize("NFKC", text or "")
-    s = s.replace(" ", "").replace("　", "")
-    return s.lower().strip()
+    text = text or ""
+    # NFKC leaves ASCII untouched and folds the ideographic space into " ".
+    s = text if text.isascii() else unicodedata.normalize("NFKC", text)
+    return s.replace(" ", "").lower().strip()
+
+
+_SKILL_SORT_KEY = attrgetter("sp", "skill_name")
+
+# (first card per normalized title, [(position, card, title) for titled cards])
+_IndexCards = tuple[dict[str, dict[str, str]], list[tuple[int, dict[str, str], str]]]
+
+
+def _prepare_index_cards(style_cards: list[dict[str, str]]) -> _IndexCards:
+    exact: dict[str, dict[str, str]] = {}
+    titled: list[tuple[int, dict[str, str], str]] = []
+    for i, card in enumerate(style_cards):
+        title = card["title_norm"]
+        if not title:
+            continue
+        exact.setdefault(title, card)
+        titled.append((i, card, title))
+    return exact, titled
 
 
 def _pick_index_style_card(
-    style_name: str, style_cards: list[dict[str, str]]
+    style_name: str, index_cards: Optional[_IndexCards]
 ) -> Optional[dict[str, str]]:
-    if not style_cards:
+    if not index_cards or not index_cards[1]:
         return None
 
     wanted = _normalize_text(_style_title(style_name))
     if not wanted:
         return None
 
-    exact: dict[str, dict[str, str]] = {}
-    for card in style_cards:
-        title = _normalize_text(str(card.get("title") or ""))
-        if title and title not in exact:
-            exact[title] = card
-
+    exact, titled_cards = index_cards
     if wanted in exact:
         return exact[wanted]
 
-    scored: list[tuple[float, dict[str, str]]] = []
-    for card in style_cards:
-        title = _normalize_text(str(card.get("title") or ""))
-        if not title:
+    # (length bound, position, card, title); the bound is real_quick_ratio's.
+    w = len(wanted)
+    titled = [
+        (2.0 * min(w, len(title)) / (w + len(title)), i, card, title)
+        for i, card, title in titled_cards
+    ]
+
+    # Only the best two scores decide the pick. Candidates are visited by
+    # descending length bound (which is >= quick_ratio >= ratio), and
+    # the scan stops once no remaining card can change the outcome: below the
+    # second score, below 0.78 with no pick yet, or too far under the pick to
+    # close the 0.08 gap (0.09 leaves room for float rounding). Ties keep the
+    # earliest card, as the stable descending sort over all cards did.
+    titled.sort(key=lambda x: (-x[0], x[1]))
+    # Argument order matches the original SequenceMatcher(None, wanted, title).
+    # set_seq2 rebuilds difflib's b2j index for every title, so reusing the
+    # matcher saves little; swapping the roles to keep b2j would change ratio()
+    # (it is not symmetric) and with it some picks.
+    matcher = SequenceMatcher(None, wanted, "")
+    best_card: Optional[dict[str, str]] = None
+    best_idx = -1
+    best_score = second_score = 0.0
+    for bound, i, card, title in titled:
+        if bound < second_score:
+            break
+        if best_score < 0.78 and bound < 0.78:
+            break
+        if best_score >= 0.78 and bound < best_score - 0.09:
+            break
+        matcher.set_seq2(title)
+        bound = matcher.quick_ratio()
+        if bound < second_score or (best_score >= 0.78 and bound < best_score - 0.09):
             continue
-        score = SequenceMatcher(None, wanted, title).ratio()
-        scored.append((score, card))
-
-    if not scored:
+        score = matcher.ratio()
+        if best_card is None or score > best_score or (score == best_score and i < best_idx):
+            if best_card is not None:
+                second_score = best_score
+            best_card, best_idx, best_score = card, i, score
+        elif score > second_score:
+            second_score = score
+
+    if best_card is None:
         return None
 
-    scored.sort(key=lambda x: x[0], reverse=True)
-    best_score, best_card = scored[0]
-    second_score = scored[1][0] if len(scored) > 1 else 0.0
-
     # Allow small naming variations/typos while avoiding ambiguous picks.
     if best_score >= 0.78 and (best_score - second_score) >= 0.08:
         return best_card
@@ -96,7 +150,6 @@ def _pick_index_style_card(
 
 
 def _skill_payload(skill: Skill) -> dict[str, Any]:
-    per_hit = list(skill.per_hit_multipliers or [])
     return {
         "skill_name": skill.skill_name,
         "weapon": skill.weapon,
@@ -105,13 +158,24 @@ def _skill_payload(skill: Skill) -> dict[str, Any]:
         "hit": skill.hit,
         "sp": skill.sp,
         "multiplier": skill.multiplier,
-        "per_hit_multipliers": per_hit,
+        "per_hit_multipliers": skill.per_hit_multipliers.tolist(),
         "notes": skill.notes,
         "basic_flag": skill.basic_flag,
         "owner_style_hint": skill.owner_style_hint,
     }
 
 
+def _skill_payloads(skills: list[Skill], cache: dict[int, dict[str, Any]]) -> list[dict[str, Any]]:
+    # Shared skills repeat across a character's styles; their rows are built once.
+    out: list[dict[str, Any]] = []
+    for sk in skills:
+        row = cache.get(id(sk))
+        if row is None:
+            row = cache[id(sk)] = _skill_payload(sk)
+        out.append(row)
+    return out
+
+
 def _style_status_payload(style: Style) -> dict[str, Any]:
     return {
         "no_lb": {
@@ -152,11 +216,29 @@ def _style_status_payload(style: Style) -> dict[str, Any]:
     }
 
 
+def _build_skill_hints(
+    characters: list[str], skills: list[Skill]
+) -> dict[str, list[tuple[Skill, str, bool]]]:
+    """Per character: (skill, normalized owner hint, hint names the character)."""
+    skills_by_character: dict[str, list[Skill]] = defaultdict(list)
+    for sk in skills:
+        skills_by_character[sk.owner_character].append(sk)
+
+    out: dict[str, list[tuple[Skill, str, bool]]] = {}
+    for ch in characters:
+        char_norm = _normalize_text(ch)
+        rows: list[tuple[Skill, str, bool]] = []
+        for sk in skills_by_character.get(ch, []):
+            hint_norm = _normalize_text((sk.owner_style_hint or "").strip())
+            rows.append((sk, hint_norm, bool(hint_norm and hint_norm == char_norm)))
+        out[ch] = rows
+    return out
+
+
 def _resolve_style_skills(
-    style: Style, skills_by_character: dict[str, list[Skill]]
+    style: Style, char_hints: list[tuple[Skill, str, bool]]
 ) -> tuple[list[Skill], list[Skill]]:
-    char_skills = list(skills_by_character.get(style.character, []))
-    if not char_skills:
+    if not char_hints:
         return [], []
 
     raw_name = clean_style_raw(style.style_raw)
@@ -168,21 +250,24 @@ def _resolve_style_skills(
         if x and len(_normalize_text(x)) >= 4
     }
 
-    char_norm = _normalize_text(style.character)
     unique: list[Skill] = []
     shared: list[Skill] = []
     seen_unique: set[str] = set()
     seen_shared: set[str] = set()
 
-    for sk in char_skills:
-        hint = (sk.owner_style_hint or "").strip()
-        hint_norm = _normalize_text(hint)
+    # At most three candidate names; one alternation only pays off for three.
+    tokens = tuple(candidate_norm)
+    search = None
+    if len(tokens) > 2:
+        search = re.compile("|".join(map(re.escape, tokens))).search
 
-        is_specific = bool(
-            hint_norm
-            and any(token in hint_norm for token in candidate_norm)
-        )
-        is_shared = bool(hint_norm and hint_norm == char_norm)
+    for sk, hint_norm, is_shared in char_hints:
+        if not hint_norm or not tokens:
+            is_specific = False
+        elif search is not None:
+            is_specific = search(hint_norm) is not None
+        else:
+            is_specific = tokens[0] in hint_norm or tokens[-1] in hint_norm
 
         if is_specific:
             if sk.skill_name not in seen_unique:
@@ -194,8 +279,8 @@ def _resolve_style_skills(
                 shared.append(sk)
                 seen_shared.add(sk.skill_name)
 
-    unique.sort(key=lambda x: (x.sp, x.skill_name))
-    shared.sort(key=lambda x: (x.sp, x.skill_name))
+    unique.sort(key=_SKILL_SORT_KEY)
+    shared.sort(key=_SKILL_SORT_KEY)
     return unique, shared
 
 
@@ -210,56 +295,67 @@ def build_style_database(
 
     styles = sorted(data.styles, key=lambda s: (s.character, s.style_name))
     characters = sorted({s.character for s in styles})
-    index_styles_by_character: dict[str, list[dict[str, str]]] = {}
-    skills_by_character: dict[str, list[Skill]] = defaultdict(list)
-    for sk in data.skills:
-        skills_by_character[sk.owner_character].append(sk)
+    index_cards_by_character: dict[str, _IndexCards] = {}
+    skill_hints = _build_skill_hints(characters, data.skills)
+
+    # Each style's cached info is read once and reused by both passes below.
+    styles_by_character: dict[str, list[Style]] = defaultdict(list)
+    cached_info_by_style: dict[tuple[str, str], Optional[StyleWebInfo]] = {}
+    for st in styles:
+        styles_by_character[st.character].append(st)
+        cached_info_by_style[(st.character, st.style_name)] = resolver.get_cached_style_info(
+            st.style_name, st.character
+        )
+
+    # Game8 character index (single fetch for all squads/characters/styles).
+    index_characters: dict[str, Any] = {}
+    if fetch_web:
+        index_payload = resolver.load_character_index()
+        index_characters = index_payload.get("characters", {})
+        if not isinstance(index_characters, dict):
+            index_characters = {}
 
-    # 1) Character metadata: squad + representative image.
-    char_meta: dict[str, dict[str, str]] = {
-        ch: {
+    # 1) Character metadata: squad + representative image. Seeded from the
+    # style cache, then the index, then a per-character fallback lookup.
+    char_meta: dict[str, dict[str, str]] = {}
+    for ch in characters:
+        meta = {
             "squad": "",
             "image_url": "",
             "page_url": "",
             "source": "",
         }
-        for ch in characters
-    }
+        char_meta[ch] = meta
 
-    # Seed from existing style cache.
-    for st in styles:
-        cinfo = resolver.get_cached_style_info(st.style_name, st.character)
-        if not cinfo:
-            continue
-        meta = char_meta[st.character]
-        if not meta["squad"] and cinfo.squad:
-            meta["squad"] = cinfo.squad
-        if not meta["image_url"] and cinfo.image_url:
-            meta["image_url"] = cinfo.image_url
-            meta["page_url"] = cinfo.page_url
-            meta["source"] = cinfo.source
-
-    # Resolve from Game8 character index (single fetch for all squads/characters/styles).
-    if fetch_web:
-        index_payload = resolver.load_character_index()
-        index_characters = index_payload.get("characters", {})
-        if isinstance(index_characters, dict):
-            for ch in characters:
-                entry = index_characters.get(ch)
-                if not isinstance(entry, dict):
-                    continue
-                meta = char_meta[ch]
-                if entry.get("squad"):
-                    meta["squad"] = str(entry["squad"])
-                if entry.get("image_url"):
-                    meta["image_url"] = str(entry["image_url"])
-                    meta["page_url"] = str(entry.get("page_url") or "")
-                    meta["source"] = str(entry.get("source") or "Game8")
-                styles_in_index = entry.get("styles")
-                if isinstance(styles_in_index, list):
-                    index_styles_by_character[ch] = [
+        for st in styles_by_character[ch]:
+            cinfo = cached_info_by_style[(ch, st.style_name)]
+            if not cinfo:
+                continue
+            if not meta["squad"] and cinfo.squad:
+                meta["squad"] = cinfo.squad
+            if not meta["image_url"] and cinfo.image_url:
+                meta["image_url"] = cinfo.image_url
+                meta["page_url"] = cinfo.page_url
+                meta["source"] = cinfo.source
+            if meta["squad"] and meta["image_url"]:
+                break
+
+        entry = index_characters.get(ch)
+        if isinstance(entry, dict):
+            if entry.get("squad"):
+                meta["squad"] = str(entry["squad"])
+            if entry.get("image_url"):
+                meta["image_url"] = str(entry["image_url"])
+                meta["page_url"] = str(entry.get("page_url") or "")
+                meta["source"] = str(entry.get("source") or "Game8")
+            styles_in_index = entry.get("styles")
+            if isinstance(styles_in_index, list):
+                # Titles are normalized once here, not on every style lookup.
+                index_cards_by_character[ch] = _prepare_index_cards(
+                    [
                         {
                             "title": str(x.get("title") or ""),
+                            "title_norm": _normalize_text(str(x.get("title") or "")),
                             "page_url": str(x.get("page_url") or ""),
                             "image_url": str(x.get("image_url") or ""),
                             "source": str(x.get("source") or "Game8"),
@@ -267,41 +363,46 @@ def build_style_database(
                         for x in styles_in_index
                         if isinstance(x, dict)
                     ]
+                )
 
-        # Fallback per character if index did not provide enough metadata.
-        for ch in characters:
-            meta = char_meta[ch]
-            if meta.get("squad") and meta.get("image_url"):
-                continue
-            info = resolver.lookup_character(ch)
-            if not info:
-                continue
-            if info.squad:
-                meta["squad"] = info.squad
-            if info.image_url:
-                meta["image_url"] = info.image_url
-                meta["page_url"] = info.page_url
-                meta["source"] = info.source
+        # Fallback if the index did not provide enough metadata.
+        if not fetch_web or (meta["squad"] and meta["image_url"]):
+            continue
+        info = resolver.lookup_character(ch)
+        if not info:
+            continue
+        if info.squad:
+            meta["squad"] = info.squad
+        if info.image_url:
+            meta["image_url"] = info.image_url
+            meta["page_url"] = info.page_url
+            meta["source"] = info.source
 
     # Optional: resolve style-specific pages/images for richer style cards.
     if fetch_style_images:
-        fetched = 0
-        for st in styles:
-            if style_fetch_limit > 0 and fetched >= style_fetch_limit:
-                break
-            _ = resolver.lookup(st.style_name, st.character)
-            fetched += 1
+        targets = styles[:style_fetch_limit] if style_fetch_limit > 0 else styles
+        # Network-bound; a few workers keep the load on Game8 polite.
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            for _ in pool.map(lambda st: resolver.lookup(st.style_name, st.character), targets):
+                pass
+        for st in targets:
+            cached_info_by_style[(st.character, st.style_name)] = resolver.get_cached_style_info(
+                st.style_name, st.character
+            )
 
     # 2) Build style entries.
     style_rows: list[dict[str, Any]] = []
+    # Styles are visited in (character, style_name) order, so both lists
+    # below fill up already sorted; the squad values are an ordered set.
     char_to_styles: dict[str, list[str]] = defaultdict(list)
-    squad_to_characters: dict[str, set[str]] = defaultdict(set)
+    squad_to_characters: dict[str, dict[str, None]] = defaultdict(dict)
+    skill_payload_cache: dict[int, dict[str, Any]] = {}
 
     for st in styles:
-        style_info = resolver.get_cached_style_info(st.style_name, st.character)
+        style_info = cached_info_by_style[(st.character, st.style_name)]
         meta = char_meta.get(st.character, {})
         index_card = _pick_index_style_card(
-            st.style_name, index_styles_by_character.get(st.character, [])
+            st.style_name, index_cards_by_character.get(st.character)
         )
 
         squad = ""
@@ -337,7 +438,7 @@ def build_style_database(
         character_id = _character_id(st.character)
         squad_ref = _squad_id(squad) if squad else ""
         style_unique_skills, character_shared_skills = _resolve_style_skills(
-            st, skills_by_character
+            st, skill_hints[st.character]
         )
         row = {
             "style_id": style_id,
@@ -364,14 +465,14 @@ def build_style_database(
             "status": _style_status_payload(st),
             "style_unique_skill_count": len(style_unique_skills),
             "character_shared_skill_count": len(character_shared_skills),
-            "style_unique_skills": [_skill_payload(x) for x in style_unique_skills],
-            "character_shared_skills": [_skill_payload(x) for x in character_shared_skills],
+            "style_unique_skills": _skill_payloads(style_unique_skills, skill_payload_cache),
+            "character_shared_skills": _skill_payloads(character_shared_skills, skill_payload_cache),
         }
         style_rows.append(row)
 
         char_to_styles[st.character].append(st.style_name)
         if squad:
-            squad_to_characters[squad].add(st.character)
+            squad_to_characters[squad][st.character] = None
 
     # 3) Character rows.
     char_rows: list[dict[str, Any]] = []
@@ -379,7 +480,8 @@ def build_style_database(
         meta = char_meta.get(ch, {})
         squad = str(meta.get("squad", "") or "")
         if squad:
-            squad_to_characters[squad].add(ch)
+            squad_to_characters[squad][ch] = None
+        ch_styles = char_to_styles.get(ch, [])
         char_rows.append(
             {
                 "character_id": _character_id(ch),
@@ -389,12 +491,14 @@ def build_style_database(
                 "image_url": meta.get("image_url", ""),
                 "page_url": meta.get("page_url", ""),
                 "source": meta.get("source", ""),
-                "style_count": len(char_to_styles.get(ch, [])),
-                "styles": sorted(char_to_styles.get(ch, [])),
+                "style_count": len(ch_styles),
+                "styles": ch_styles,
             }
         )
 
-    char_rows.sort(key=lambda x: (_squad_sort_key(x.get("squad", "")), x["character"]))
+    squad_keys = {sq: _squad_sort_key(sq) for sq in squad_to_characters}
+    squad_keys[""] = _squad_sort_key("")
+    char_rows.sort(key=lambda x: (squad_keys[x["squad"]], x["character"]))
 
     # 4) Squad rows.
     squad_rows: list[dict[str, Any]] = []
@@ -404,10 +508,10 @@ def build_style_database(
                 "squad_id": _squad_id(squad),
                 "squad": squad,
                 "character_count": len(chars),
-                "characters": sorted(chars),
+                "characters": list(chars),
             }
         )
-    squad_rows.sort(key=lambda x: _squad_sort_key(x["squad"]))
+    squad_rows.sort(key=lambda x: squad_keys[x["squad"]])
 
     payload = {
         "meta": {
@@ -428,17 +532,10 @@ def build_style_database(
 def write_style_database_json(payload: dict[str, Any], out_path: str | Path) -> None:
     out = Path(out_path)
     out.parent.mkdir(parents=True, exist_ok=True)
-    out.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    write_json(out, payload)
 
 
-def write_style_database_html(payload: dict[str, Any], out_path: str | Path) -> None:
-    out = Path(out_path)
-    out.parent.mkdir(parents=True, exist_ok=True)
-
-    # Inline payload for single-file portability.
-    payload_js = json.dumps(payload, ensure_ascii=False)
-
-    html = f"""
+_HTML_TEMPLATE = """
 <!doctype html>
 <html lang="ja">
 <head>
@@ -446,7 +543,7 @@ def write_style_database_html(payload: dict[str, Any], out_path: str | Path) ->
   <meta name="viewport" content="width=device-width, initial-scale=1" />
   <title>HBR 全スタイルDB</title>
   <style>
-    :root {{
+    :root {
       --bg: #f1efe8;
       --ink: #1f2023;
       --muted: #5d6068;
@@ -455,9 +552,9 @@ def write_style_database_html(payload: dict[str, Any], out_path: str | Path) ->
       --accent: #0d6e66;
       --accent-2: #9f3414;
       --chip: #eef7f5;
-    }}
-    * {{ box-sizing: border-box; }}
-    body {{
+    }
+    * { box-sizing: border-box; }
+    body {
       margin: 0;
       color: var(--ink);
       font-family: "Hiragino Sans", "Yu Gothic", sans-serif;
@@ -465,41 +562,41 @@ def write_style_database_html(payload: dict[str, Any], out_path: str | Path) ->
         radial-gradient(1100px 700px at -10% -20%, #fff8e8 0%, transparent 55%),
         radial-gradient(900px 500px at 120% 0%, #dff2ef 0%, transparent 45%),
         var(--bg);
-    }}
-    .shell {{
+    }
+    .shell {
       max-width: 1480px;
       margin: 0 auto;
       padding: 18px;
-    }}
-    h1 {{ margin: 0; font-size: 30px; letter-spacing: .02em; }}
-    .sub {{ color: var(--muted); margin-top: 8px; font-size: 14px; }}
-    .meta {{
+    }
+    h1 { margin: 0; font-size: 30px; letter-spacing: .02em; }
+    .sub { color: var(--muted); margin-top: 8px; font-size: 14px; }
+    .meta {
       margin-top: 12px;
       display: flex;
       flex-wrap: wrap;
       gap: 8px;
-    }}
-    .meta .tag {{
+    }
+    .meta .tag {
       background: var(--panel);
       border: 1px solid var(--line);
       border-radius: 999px;
       font-size: 12px;
       padding: 4px 10px;
-    }}
-    .layout {{
+    }
+    .layout {
       margin-top: 14px;
       display: grid;
       grid-template-columns: 340px minmax(0,1fr);
       gap: 12px;
-    }}
-    .panel {{
+    }
+    .panel {
       background: var(--panel);
       border: 1px solid var(--line);
       border-radius: 14px;
       padding: 12px;
-    }}
-    .label {{ font-size: 12px; font-weight: 700; color: #30343a; margin-bottom: 4px; }}
-    input, select {{
+    }
+    .label { font-size: 12px; font-weight: 700; color: #30343a; margin-bottom: 4px; }
+    input, select {
       width: 100%;
       border: 1px solid var(--line);
       border-radius: 10px;
@@ -507,24 +604,24 @@ def write_style_database_html(payload: dict[str, Any], out_path: str | Path) ->
       background: #fff;
       color: var(--ink);
       margin-bottom: 8px;
-    }}
-    .checkbox-row {{
+    }
+    .checkbox-row {
       display: flex;
       align-items: center;
       gap: 8px;
       margin-bottom: 8px;
       font-size: 13px;
-    }}
-    .squad-map {{
+    }
+    .squad-map {
       margin-top: 8px;
       max-height: 280px;
       overflow: auto;
       border-top: 1px dashed var(--line);
       padding-top: 8px;
-    }}
-    .squad-item {{ margin-bottom: 10px; }}
-    .squad-name {{ font-weight: 700; font-size: 13px; color: #21343a; }}
-    .char-chip {{
+    }
+    .squad-item { margin-bottom: 10px; }
+    .squad-name { font-weight: 700; font-size: 13px; color: #21343a; }
+    .char-chip {
       display: inline-block;
       margin: 5px 5px 0 0;
       background: var(--chip);
@@ -533,27 +630,27 @@ def write_style_database_html(payload: dict[str, Any], out_path: str | Path) ->
       border-radius: 999px;
       font-size: 12px;
       cursor: pointer;
-    }}
-    .result-header {{
+    }
+    .result-header {
       display: flex;
       justify-content: space-between;
       align-items: center;
       margin-bottom: 8px;
-    }}
-    .count {{ font-size: 13px; color: var(--muted); }}
-    .cards {{
+    }
+    .count { font-size: 13px; color: var(--muted); }
+    .cards {
       display: grid;
       grid-template-columns: repeat(auto-fill, minmax(220px, 1fr));
       gap: 10px;
-    }}
-    .card {{
+    }
+    .card {
       border: 1px solid var(--line);
       border-radius: 12px;
       background: #fff;
       overflow: hidden;
       cursor: pointer;
-    }}
-    .cover {{
+    }
+    .cover {
       width: 100%;
       height: 170px;
       background: linear-gradient(135deg, #d6dce5, #e7d9cc);
@@ -564,12 +661,12 @@ def write_style_database_html(payload: dict[str, Any], out_path: str | Path) ->
       font-size: 30px;
       font-weight: 700;
       letter-spacing: 0.05em;
-    }}
-    .cover img {{ width: 100%; height: 100%; object-fit: cover; display:block; }}
-    .body {{ padding: 9px 10px 10px; }}
-    .name {{ font-size: 14px; font-weight: 700; line-height: 1.35; }}
-    .line {{ font-size: 12px; color: #414752; margin-top: 5px; }}
-    .badge {{
+    }
+    .cover img { width: 100%; height: 100%; object-fit: cover; display:block; }
+    .body { padding: 9px 10px 10px; }
+    .name { font-size: 14px; font-weight: 700; line-height: 1.35; }
+    .line { font-size: 12px; color: #414752; margin-top: 5px; }
+    .badge {
       display: inline-block;
       font-size: 11px;
       margin-right: 6px;
@@ -578,8 +675,8 @@ def write_style_database_html(payload: dict[str, Any], out_path: str | Path) ->
       border: 1px solid #d5dfe6;
       background: #f4f8fb;
       padding: 2px 7px;
-    }}
-    .tier {{
+    }
+    .tier {
       margin-top: 6px;
       font-size: 11px;
       color: #2e4a43;
@@ -588,19 +685,19 @@ def write_style_database_html(payload: dict[str, Any], out_path: str | Path) ->
       border-radius: 7px;
       padding: 4px 6px;
       line-height: 1.35;
-    }}
-    .detail {{
+    }
+    .detail {
       margin-top: 12px;
       border-top: 1px dashed var(--line);
       padding-top: 10px;
-    }}
-    .detail h3 {{ margin: 0 0 8px; font-size: 15px; }}
-    .detail .row {{ font-size: 12px; margin-bottom: 6px; }}
-    .detail a {{ color: var(--accent); text-decoration: none; }}
-    @media (max-width: 1080px) {{
-      .layout {{ grid-template-columns: 1fr; }}
-      .squad-map {{ max-height: 190px; }}
-    }}
+    }
+    .detail h3 { margin: 0 0 8px; font-size: 15px; }
+    .detail .row { font-size: 12px; margin-bottom: 6px; }
+    .detail a { color: var(--accent); text-decoration: none; }
+    @media (max-width: 1080px) {
+      .layout { grid-template-columns: 1fr; }
+      .squad-map { max-height: 190px; }
+    }
   </style>
 </head>
 <body>
@@ -642,193 +739,193 @@ def write_style_database_html(payload: dict[str, Any], out_path: str | Path) ->
   </div>
 
 <script>
-const DB = {payload_js};
+const DB = __PAYLOAD__;
 let current = DB.styles.slice();
 let selectedStyleId = '';
 
-function esc(s) {{
+function esc(s) {
   return String(s || '')
     .replaceAll('&', '&amp;')
     .replaceAll('<', '&lt;')
     .replaceAll('>', '&gt;')
     .replaceAll('"', '&quot;');
-}}
+}
 
-function initMeta() {{
+function initMeta() {
   const meta = document.getElementById('meta');
-  const m = DB.meta || {{}};
+  const m = DB.meta || {};
   meta.innerHTML = `
-    <span class="tag">style: ${{m.style_count || 0}}</span>
-    <span class="tag">character: ${{m.character_count || 0}}</span>
-    <span class="tag">squad: ${{m.squad_count || 0}}</span>
-    <span class="tag">tool: ${{esc(m.tool_version || '-')}}</span>
-    <span class="tag">generated: ${{esc(m.generated_at || '-')}}</span>
+    <span class="tag">style: ${m.style_count || 0}</span>
+    <span class="tag">character: ${m.character_count || 0}</span>
+    <span class="tag">squad: ${m.squad_count || 0}</span>
+    <span class="tag">tool: ${esc(m.tool_version || '-')}</span>
+    <span class="tag">generated: ${esc(m.generated_at || '-')}</span>
   `;
-}}
+}
 
-function initFilters() {{
+function initFilters() {
   const squadSel = document.getElementById('squadFilter');
   const charSel = document.getElementById('charFilter');
 
   squadSel.innerHTML = '<option value="">すべて</option>';
-  for (const s of DB.squads || []) {{
+  for (const s of DB.squads || []) {
     const opt = document.createElement('option');
     opt.value = s.squad || '';
-    opt.textContent = `${{s.squad || '(未設定)'}} (${{s.character_count}})`;
+    opt.textContent = `${s.squad || '(未設定)'} (${s.character_count})`;
     squadSel.appendChild(opt);
-  }}
+  }
 
   charSel.innerHTML = '<option value="">すべて</option>';
-  for (const c of DB.characters || []) {{
+  for (const c of DB.characters || []) {
     const opt = document.createElement('option');
     opt.value = c.character;
-    opt.textContent = `${{c.character}} (${{c.squad || '-'}})`;
+    opt.textContent = `${c.character} (${c.squad || '-'})`;
     charSel.appendChild(opt);
-  }}
-}}
+  }
+}
 
-function renderSquadMap() {{
+function renderSquadMap() {
   const root = document.getElementById('squadMap');
   root.innerHTML = '';
-  for (const s of DB.squads || []) {{
+  for (const s of DB.squads || []) {
     const box = document.createElement('div');
     box.className = 'squad-item';
     const name = document.createElement('div');
     name.className = 'squad-name';
-    name.textContent = `${{s.squad || '(未設定)'}}`;
+    name.textContent = `${s.squad || '(未設定)'}`;
     box.appendChild(name);
 
-    for (const ch of s.characters || []) {{
+    for (const ch of s.characters || []) {
       const chip = document.createElement('span');
       chip.className = 'char-chip';
       chip.textContent = ch;
-      chip.onclick = () => {{
+      chip.onclick = () => {
         document.getElementById('charFilter').value = ch;
         applyFilter();
-      }};
+      };
       box.appendChild(chip);
-    }}
+    }
 
     root.appendChild(box);
-  }}
-}}
+  }
+}
 
-function raritySet() {{
+function raritySet() {
   const vals = new Set();
-  document.querySelectorAll('.rarity').forEach((x) => {{ if (x.checked) vals.add(x.value); }});
+  document.querySelectorAll('.rarity').forEach((x) => { if (x.checked) vals.add(x.value); });
   return vals;
-}}
+}
 
-function applyFilter() {{
+function applyFilter() {
   const q = document.getElementById('search').value.trim();
   const squad = document.getElementById('squadFilter').value;
   const ch = document.getElementById('charFilter').value;
   const rarity = raritySet();
 
-  current = (DB.styles || []).filter((s) => {{
+  current = (DB.styles || []).filter((s) => {
     if (!rarity.has(s.rarity)) return false;
     if (squad && (s.squad || '') !== squad) return false;
     if (ch && s.character !== ch) return false;
-    if (q) {{
-      const hay = `${{s.style_name}} ${{s.character}} ${{s.alias || ''}} ${{s.style_raw || ''}}`;
+    if (q) {
+      const hay = `${s.style_name} ${s.character} ${s.alias || ''} ${s.style_raw || ''}`;
       if (!hay.includes(q)) return false;
-    }}
+    }
     return true;
-  }});
+  });
 
   renderCards();
   renderDetail();
-}}
+}
 
-function cardCover(style) {{
-  if (style.image_url) {{
-    return `<img src="${{esc(style.image_url)}}" alt="${{esc(style.style_name)}}" />`;
-  }}
+function cardCover(style) {
+  if (style.image_url) {
+    return `<img src="${esc(style.image_url)}" alt="${esc(style.style_name)}" />`;
+  }
   const txt = (style.character || '?').slice(0, 2);
   return esc(txt);
-}}
+}
 
-function renderCards() {{
+function renderCards() {
   const cards = document.getElementById('cards');
   const count = document.getElementById('count');
-  count.textContent = `表示: ${{current.length}} / 全体: ${{(DB.styles || []).length}}`;
+  count.textContent = `表示: ${current.length} / 全体: ${(DB.styles || []).length}`;
 
   cards.innerHTML = '';
-  for (const s of current) {{
+  for (const s of current) {
     const tierParts = [];
-    if (s.tier_overall) tierParts.push(`総合 Tier${{s.tier_overall}}`);
+    if (s.tier_overall) tierParts.push(`総合 Tier${s.tier_overall}`);
     if (s.tier_roles) tierParts.push(s.tier_roles);
     const tierHtml = tierParts.length
-      ? `<div class="tier">${{esc(tierParts.join(' / '))}}</div>`
+      ? `<div class="tier">${esc(tierParts.join(' / '))}</div>`
       : '';
 
     const div = document.createElement('article');
     div.className = 'card';
-    div.onclick = () => {{ selectedStyleId = s.style_id; renderDetail(); }};
+    div.onclick = () => { selectedStyleId = s.style_id; renderDetail(); };
     div.innerHTML = `
-      <div class="cover">${{cardCover(s)}}</div>
+      <div class="cover">${cardCover(s)}</div>
       <div class="body">
-        <div class="name">${{esc(s.style_name)}}</div>
-        <div class="line">${{esc(s.character)}} / ${{esc(s.squad || '-')}}</div>
-        <span class="badge">${{esc(s.rarity)}}</span>
-        <span class="badge">ATK+${{Number(s.attack_bonus || 0).toFixed(2)}}</span>
-        <span class="badge">DEF+${{Number(s.status?.effective?.def || 0).toFixed(2)}}</span>
-        <span class="badge">CRD+${{Number(s.crit_damage_bonus || 0).toFixed(2)}}</span>
-        <span class="badge">固有${{Number(s.style_unique_skill_count || 0)}}</span>
-        ${{tierHtml}}
+        <div class="name">${esc(s.style_name)}</div>
+        <div class="line">${esc(s.character)} / ${esc(s.squad || '-')}</div>
+        <span class="badge">${esc(s.rarity)}</span>
+        <span class="badge">ATK+${Number(s.attack_bonus || 0).toFixed(2)}</span>
+        <span class="badge">DEF+${Number(s.status?.effective?.def || 0).toFixed(2)}</span>
+        <span class="badge">CRD+${Number(s.crit_damage_bonus || 0).toFixed(2)}</span>
+        <span class="badge">固有${Number(s.style_unique_skill_count || 0)}</span>
+        ${tierHtml}
       </div>
     `;
     cards.appendChild(div);
-  }}
-}}
+  }
+}
 
-function renderDetail() {{
+function renderDetail() {
   const root = document.getElementById('detail');
   const style = current.find((x) => x.style_id === selectedStyleId) || current[0];
-  if (!style) {{
+  if (!style) {
     root.innerHTML = '<h3>詳細</h3><div class="row">データがありません</div>';
     return;
-  }}
+  }
 
   const linked = (DB.styles || []).filter((x) => x.character === style.character).map((x) => x.style_name);
   const source = style.page_url
-    ? `<a href="${{esc(style.page_url)}}" target="_blank" rel="noopener">攻略ページ</a>`
+    ? `<a href="${esc(style.page_url)}" target="_blank" rel="noopener">攻略ページ</a>`
     : '-';
-  const st = style.status || {{}};
-  const noLb = st.no_lb || {{}};
-  const lb3 = st.lb3 || {{}};
-  const eff = st.effective || {{}};
+  const st = style.status || {};
+  const noLb = st.no_lb || {};
+  const lb3 = st.lb3 || {};
+  const eff = st.effective || {};
 
-  const fmtSkill = (x) => {{
+  const fmtSkill = (x) => {
     const perHit = (x.per_hit_multipliers && x.per_hit_multipliers.length)
-      ? ` / hit内訳:${{x.per_hit_multipliers.map((v) => Number(v).toFixed(2)).join(',')}}`
+      ? ` / hit内訳:${x.per_hit_multipliers.map((v) => Number(v).toFixed(2)).join(',')}`
       : '';
-    return `${{esc(x.skill_name)}} [${{esc(x.weapon||'-')}}/${{esc(x.element||'-')}}] SP:${{Number(x.sp||0).toFixed(0)}} 倍率:${{Number(x.multiplier||0).toFixed(2)}}${{perHit}}`;
-  }};
-  const uniqueSkills = (style.style_unique_skills || []).map((x) => `<div class="row">・${{fmtSkill(x)}}</div>`).join('');
-  const sharedSkills = (style.character_shared_skills || []).map((x) => `<div class="row">・${{fmtSkill(x)}}</div>`).join('');
+    return `${esc(x.skill_name)} [${esc(x.weapon||'-')}/${esc(x.element||'-')}] SP:${Number(x.sp||0).toFixed(0)} 倍率:${Number(x.multiplier||0).toFixed(2)}${perHit}`;
+  };
+  const uniqueSkills = (style.style_unique_skills || []).map((x) => `<div class="row">・${fmtSkill(x)}</div>`).join('');
+  const sharedSkills = (style.character_shared_skills || []).map((x) => `<div class="row">・${fmtSkill(x)}</div>`).join('');
 
   root.innerHTML = `
     <h3>詳細</h3>
-    <div class="row"><b>スタイル:</b> ${{esc(style.style_name)}}</div>
-    <div class="row"><b>キャラ:</b> ${{esc(style.character)}}</div>
-    <div class="row"><b>部隊:</b> ${{esc(style.squad || '-')}}</div>
-    <div class="row"><b>レア:</b> ${{esc(style.rarity)}}</div>
-    <div class="row"><b>補正(実効):</b> ATK ${{Number(eff.atk||0).toFixed(2)}} / DEF ${{Number(eff.def||0).toFixed(2)}} / クリ威力 ${{Number(eff.crit_damage||0).toFixed(2)}} / クリ率 ${{Number(eff.crit_rate||0).toFixed(2)}} / 破壊率 ${{Number(eff.destruction||0).toFixed(2)}}</div>
-    <div class="row"><b>無凸:</b> ATK ${{Number(noLb.atk||0).toFixed(2)}}(${{esc(noLb.atk_scope||'-')}}) / DEF ${{Number(noLb.def||0).toFixed(2)}}(${{esc(noLb.def_scope||'-')}}) / クリ威力 ${{Number(noLb.crit_damage||0).toFixed(2)}} / クリ率 ${{Number(noLb.crit_rate||0).toFixed(2)}} / 破壊率 ${{Number(noLb.destruction||0).toFixed(2)}}</div>
-    <div class="row"><b>3凸:</b> ATK ${{Number(lb3.atk||0).toFixed(2)}}(${{esc(lb3.atk_scope||'-')}}) / DEF ${{Number(lb3.def||0).toFixed(2)}}(${{esc(lb3.def_scope||'-')}}) / クリ威力 ${{Number(lb3.crit_damage||0).toFixed(2)}} / クリ率 ${{Number(lb3.crit_rate||0).toFixed(2)}} / 破壊率 ${{Number(lb3.destruction||0).toFixed(2)}}</div>
-    <div class="row"><b>パッシブ:</b> 無凸=${{esc(st.passive_no_lb||'-')}} / 3凸=${{esc(st.passive_lb3||'-')}}</div>
-    <div class="row"><b>属性/宝珠:</b> ${{esc(st.element_tag||'-')}} / ${{Number(st.jewel_type||0).toFixed(0)}}</div>
-    <div class="row"><b>同キャラのスタイル:</b> ${{esc(linked.join(' / '))}}</div>
-    <div class="row"><b>固有スキル(${{Number(style.style_unique_skill_count||0)}}件):</b></div>
-    ${{uniqueSkills || '<div class="row">・なし</div>'}}
-    <div class="row"><b>共通スキル(${{Number(style.character_shared_skill_count||0)}}件):</b></div>
-    ${{sharedSkills || '<div class="row">・なし</div>'}}
-    <div class="row"><b>参照:</b> ${{source}}</div>
+    <div class="row"><b>スタイル:</b> ${esc(style.style_name)}</div>
+    <div class="row"><b>キャラ:</b> ${esc(style.character)}</div>
+    <div class="row"><b>部隊:</b> ${esc(style.squad || '-')}</div>
+    <div class="row"><b>レア:</b> ${esc(style.rarity)}</div>
+    <div class="row"><b>補正(実効):</b> ATK ${Number(eff.atk||0).toFixed(2)} / DEF ${Number(eff.def||0).toFixed(2)} / クリ威力 ${Number(eff.crit_damage||0).toFixed(2)} / クリ率 ${Number(eff.crit_rate||0).toFixed(2)} / 破壊率 ${Number(eff.destruction||0).toFixed(2)}</div>
+    <div class="row"><b>無凸:</b> ATK ${Number(noLb.atk||0).toFixed(2)}(${esc(noLb.atk_scope||'-')}) / DEF ${Number(noLb.def||0).toFixed(2)}(${esc(noLb.def_scope||'-')}) / クリ威力 ${Number(noLb.crit_damage||0).toFixed(2)} / クリ率 ${Number(noLb.crit_rate||0).toFixed(2)} / 破壊率 ${Number(noLb.destruction||0).toFixed(2)}</div>
+    <div class="row"><b>3凸:</b> ATK ${Number(lb3.atk||0).toFixed(2)}(${esc(lb3.atk_scope||'-')}) / DEF ${Number(lb3.def||0).toFixed(2)}(${esc(lb3.def_scope||'-')}) / クリ威力 ${Number(lb3.crit_damage||0).toFixed(2)} / クリ率 ${Number(lb3.crit_rate||0).toFixed(2)} / 破壊率 ${Number(lb3.destruction||0).toFixed(2)}</div>
+    <div class="row"><b>パッシブ:</b> 無凸=${esc(st.passive_no_lb||'-')} / 3凸=${esc(st.passive_lb3||'-')}</div>
+    <div class="row"><b>属性/宝珠:</b> ${esc(st.element_tag||'-')} / ${Number(st.jewel_type||0).toFixed(0)}</div>
+    <div class="row"><b>同キャラのスタイル:</b> ${esc(linked.join(' / '))}</div>
+    <div class="row"><b>固有スキル(${Number(style.style_unique_skill_count||0)}件):</b></div>
+    ${uniqueSkills || '<div class="row">・なし</div>'}
+    <div class="row"><b>共通スキル(${Number(style.character_shared_skill_count||0)}件):</b></div>
+    ${sharedSkills || '<div class="row">・なし</div>'}
+    <div class="row"><b>参照:</b> ${source}</div>
   `;
-}}
+}
 
-function bootstrap() {{
+function bootstrap() {
   initMeta();
   initFilters();
   renderSquadMap();
@@ -839,12 +936,23 @@ function bootstrap() {{
   document.querySelectorAll('.rarity').forEach((x) => x.addEventListener('change', applyFilter));
 
   applyFilter();
-}}
+}
 
 bootstrap();
 </script>
 </body>
 </html>
-""".strip()
+"""
+_HTML_HEAD, _HTML_TAIL = (
+    part.encode("utf-8") for part in _HTML_TEMPLATE.strip().split("__PAYLOAD__")
+)
+
 
-    out.write_text(html, encoding="utf-8")
+def write_style_database_html(payload: dict[str, Any], out_path: str | Path) -> None:
+    out = Path(out_path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with out.open("wb") as fh:
+        fh.write(_HTML_HEAD)
+        # Inline payload for single-file portability.
+        fh.write(dumps_json_compact(payload))
+        fh.write(_HTML_TAIL)
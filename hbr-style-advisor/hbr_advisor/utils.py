@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 from typing import Optional
 
 
@@ -13,8 +14,14 @@ def parse_float(value: object, default: float = 0.0) -> float:
         return default
     if isinstance(value, (int, float)):
         return float(value)
+    return _parse_float_text(value if isinstance(value, str) else str(value), default)
 
-    text = str(value).strip()
+
+# Cell texts repeat heavily across rows, so the string path is memoized on
+# (text, default); None/numeric inputs are handled above without hashing.
+@lru_cache(maxsize=8192)
+def _parse_float_text(text: str, default: float) -> float:
+    text = text.strip()
     if not text:
         return default
 
@@ -39,8 +46,8 @@ def parse_float(value: object, default: float = 0.0) -> float:
 def parse_optional_float(value: object) -> Optional[float]:
     if value is None:
         return None
-    text = str(value).strip()
-    if not text:
+    text = value if isinstance(value, str) else str(value)
+    if not text or text.isspace():
         return None
     return parse_float(value, default=0.0)
 
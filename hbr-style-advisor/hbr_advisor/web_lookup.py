@@ -3,8 +3,11 @@ from __future__ import annotations
 import html
 import json
 import re
+import threading
 import time
+from concurrent.futures import Future
 from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
 from typing import Any, Optional
 from urllib.parse import quote
@@ -16,6 +19,16 @@ CHARACTER_INDEX_KEY = "__GAME8_CHARACTER_INDEX__"
 CHARACTER_INDEX_URL = "https://game8.jp/heavenburnsred/425628"
 
 
+def image_tag_html(image_url: str, alt: str) -> str:
+    """Escaped report <img> tag for ``image_url``, or "" when there is none."""
+    if not image_url:
+        return ""
+    return (
+        f'<img src="{html.escape(image_url)}" alt="{html.escape(alt)}" '
+        'style="width:100%;max-height:260px;object-fit:cover;border-radius:10px;" />'
+    )
+
+
 @dataclass
 class StyleWebInfo:
     style_name: str
@@ -29,6 +42,18 @@ class StyleWebInfo:
     tier_overall: str = ""
     tier_roles: str = ""
 
+    # Report fragments, memoized on the instance. The resolver finishes
+    # filling the fields before handing an info out, and nothing edits them after.
+    @cached_property
+    def image_html_fragment(self) -> str:
+        return image_tag_html(self.image_url, self.style_name)
+
+    @cached_property
+    def source_html_fragment(self) -> str:
+        if not (self.image_url and self.page_url):
+            return ""
+        return f'<a href="{html.escape(self.page_url)}" target="_blank" rel="noopener">source</a>'
+
     def to_dict(self) -> dict[str, Any]:
         return {
             "style_name": self.style_name,
@@ -48,6 +73,13 @@ class StyleWebInfoResolver:
     def __init__(self, cache_path: str | Path):
         self.cache_path = Path(cache_path)
         self.cache: dict[str, dict[str, Any]] = {}
+        # Guards cache writes so lookups may run from several threads.
+        self._cache_lock = threading.Lock()
+        # Single-flight: concurrent fetches of one URL (or of the character
+        # index) share a single request instead of hitting Game8 in parallel.
+        self._index_lock = threading.Lock()
+        self._inflight_lock = threading.Lock()
+        self._inflight: dict[str, Future[str]] = {}
         self._load_cache()
 
     def _load_cache(self) -> None:
@@ -63,6 +95,11 @@ class StyleWebInfoResolver:
             json.dumps(self.cache, ensure_ascii=False, indent=2), encoding="utf-8"
         )
 
+    def _store(self, key: str, value: dict[str, Any]) -> None:
+        with self._cache_lock:
+            self.cache[key] = value
+            self._save_cache()
+
     def lookup(self, style_name: str, character: str) -> Optional[StyleWebInfo]:
         key = f"{character}|{style_name}"
         cached = self.cache.get(key)
@@ -114,8 +151,7 @@ class StyleWebInfoResolver:
                     best_info.page_title = fallback.page_title
 
         if best_info is not None and best_conf >= 0.35:
-            self.cache[key] = best_info.to_dict()
-            self._save_cache()
+            self._store(key, best_info.to_dict())
             return best_info
         return None
 
@@ -130,16 +166,14 @@ class StyleWebInfoResolver:
         if isinstance(entry, dict):
             info = self._from_character_index_entry(character, entry)
             if info is not None:
-                self.cache[key] = info.to_dict()
-                self._save_cache()
+                self._store(key, info.to_dict())
                 return info
 
         info = self._lookup_character_page(style_name=character, character=character)
         if info is None:
             return None
 
-        self.cache[key] = info.to_dict()
-        self._save_cache()
+        self._store(key, info.to_dict())
         return info
 
     def get_cached_style_info(self, style_name: str, character: str) -> Optional[StyleWebInfo]:
@@ -157,6 +191,12 @@ class StyleWebInfoResolver:
         return None
 
     def load_character_index(self, refresh: bool = False) -> dict[str, Any]:
+        # Callers that arrive while the index is being fetched wait and then
+        # find it cached.
+        with self._index_lock:
+            return self._load_character_index(refresh)
+
+    def _load_character_index(self, refresh: bool) -> dict[str, Any]:
         cached = self.cache.get(CHARACTER_INDEX_KEY)
         if (
             not refresh
@@ -181,8 +221,7 @@ class StyleWebInfoResolver:
             "fetched_at": time.time(),
             "characters": parsed["characters"],
         }
-        self.cache[CHARACTER_INDEX_KEY] = payload
-        self._save_cache()
+        self._store(CHARACTER_INDEX_KEY, payload)
         return payload
 
     def _from_cache_dict(
@@ -314,10 +353,28 @@ class StyleWebInfoResolver:
         return dedup[:10]
 
     def _fetch_html(self, url: str) -> str:
-        req = Request(url, headers={"User-Agent": USER_AGENT})
-        with urlopen(req, timeout=10) as resp:
-            body = resp.read()
-        return body.decode("utf-8", errors="ignore")
+        with self._inflight_lock:
+            pending = self._inflight.get(url)
+            if pending is None:
+                future: Future[str] = Future()
+                self._inflight[url] = future
+        if pending is not None:
+            return pending.result()
+
+        try:
+            req = Request(url, headers={"User-Agent": USER_AGENT})
+            with urlopen(req, timeout=10) as resp:
+                body = resp.read()
+            text = body.decode("utf-8", errors="ignore")
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(text)
+            return text
+        finally:
+            with self._inflight_lock:
+                del self._inflight[url]
 
     def _fetch_game8_info(
         self, page_url: str, style_name: str, character: str